@@ -0,0 +1,107 @@
+"""
+Compares formatting every cell with the old per-cell style objects against
+the cached StyleBundle for each column, cell by cell and through the column
+at a time format_all_cells.
+
+Run from the repo root with `python -m benchmarks.bench_format`.
+"""
+
+import os, tempfile
+import openpyxl
+from openpyxl.styles import Alignment
+
+from easierexcel import Excel, Sheet, benchmark
+
+ROWS = 10_000
+COLUMNS = [
+    "Name",
+    "Price",
+    "Discount",
+    "ID",
+    "Hours",
+    "Days Till",
+    "Last Updated",
+    "Notes",
+]
+OPTIONS = {
+    "left_align": ["Name"],
+    "light_grey_fill": ["Discount"],
+    "percent": ["Discount"],
+    "currency": ["Price"],
+    "integer": ["ID"],
+    "decimal": ["Hours"],
+    "count_days": ["Days Till"],
+    "date": ["Last Updated"],
+}
+
+
+def make_workbook(path: str, rows: int = ROWS):
+    """
+    Saves a workbook with `rows` rows of sample data to `path`.
+    """
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    ws.append(COLUMNS)
+    for i in range(rows):
+        ws.append([f"Name {i}", i * 1.5, 0.1, i, 2.5, 10, None, "Note"])
+    wb.save(path)
+
+
+def legacy_format_cell(sheet: Sheet, column: str, row_i: int, col_i: int):
+    """
+    The per-cell formatting Sheet.format_cell used before style bundles.
+    """
+    cell = sheet.cur_sheet.cell(row=row_i, column=col_i)
+    formatting = sheet.column_formats[column]
+    if "percent" in formatting:
+        sheet.set_style(cell, format="percent")
+    elif "currency" in formatting:
+        sheet.set_style(cell, format="currency")
+    elif "integer" in formatting:
+        cell.number_format = "0"
+    elif "decimal" in formatting:
+        cell.number_format = "#,#0.0"
+    elif "count_days" in formatting:
+        cell.number_format = '# "Days"'
+    elif cell.is_date:
+        cell.number_format = "mm-dd-yy"
+    if "default_border" in formatting:
+        sheet.set_border(cell)
+    if "left_align" in formatting:
+        cell.alignment = Alignment(horizontal="left")
+    elif "center_align" in formatting:
+        cell.alignment = Alignment(horizontal="center")
+    elif "right_align" in formatting:
+        cell.alignment = Alignment(horizontal="right")
+    if "light_grey_fill" in formatting:
+        sheet.set_fill(cell, color="F2F2F2")
+
+
+@benchmark
+def legacy_format(sheet: Sheet):
+    sheet.column_formats = sheet.get_column_formats()
+    for column, col_i in sheet.col_idx.items():
+        for row_i in sheet.row_idx.values():
+            legacy_format_cell(sheet, column, row_i, col_i)
+
+
+@benchmark
+def bundle_format(sheet: Sheet):
+    for column, col_i in sheet.col_idx.items():
+        for row_i in sheet.row_idx.values():
+            sheet.format_cell(column, row_i, col_i)
+
+
+@benchmark
+def format_all_cells(sheet: Sheet):
+    sheet.format_all_cells()
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.xlsx")
+        make_workbook(path)
+        for func in [legacy_format, bundle_format, format_all_cells]:
+            excel = Excel(path, use_logging=False)
+            func(Sheet(excel, "Name", "Data", options=OPTIONS))
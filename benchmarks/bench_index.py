@@ -0,0 +1,66 @@
+"""
+Compares the old per-cell index construction with the single sweep
+used by Sheet on a 100k row sheet.
+
+Run from the repo root with `python -m benchmarks.bench_index`.
+"""
+
+import os, tempfile
+import openpyxl
+
+from easierexcel import Excel, Sheet, benchmark
+
+ROWS = 100_000
+
+
+def make_workbook(path: str, rows: int = ROWS):
+    """
+    Saves a workbook with `rows` rows of sample data to `path`.
+    """
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    ws.append(["ID", "Name", "Birth Month", "Birth Year", "Age", "Price"])
+    for i in range(rows):
+        ws.append([i, f"Name {i}", "June", 1990 + i % 30, i % 90, i * 1.5])
+    wb.save(path)
+
+
+@benchmark
+def legacy_indexes(sheet: Sheet):
+    """
+    The per-cell index construction Sheet used before the single sweep.
+    """
+    col_index = {}
+    for i in range(1, len(sheet.cur_sheet["1"]) + 1):
+        title = sheet.cur_sheet.cell(row=1, column=i).value
+        if title is not None:
+            col_index[title] = i
+    row_idx = {}
+    total_rows = len(sheet.cur_sheet["A"])
+    for row in range(1, total_rows):
+        column = col_index[sheet.column_name]
+        title = sheet.cur_sheet.cell(row=row + 1, column=column).value
+        if title is not None:
+            row_idx[title] = row + 1
+    return col_index, row_idx
+
+
+@benchmark
+def sweep_indexes(sheet: Sheet):
+    """
+    The current single sweep index construction.
+    """
+    col_index = sheet.get_column_index()
+    return col_index, sheet.get_row_index(sheet.column_name)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.xlsx")
+        make_workbook(path)
+        excel = Excel(path, use_logging=False)
+        sheet = Sheet(excel, "Name", "Data")
+        legacy = legacy_indexes(sheet)
+        sweep = sweep_indexes(sheet)
+        assert legacy == sweep
@@ -0,0 +1,44 @@
+"""
+Compares the saved file size and save time after formatting every cell
+with per-cell styles against formatting with named styles.
+
+Run from the repo root with `python -m benchmarks.bench_named_styles`.
+"""
+
+import os, tempfile, time
+
+from easierexcel import Excel, Sheet, benchmark
+from benchmarks.bench_format import OPTIONS, make_workbook
+
+
+@benchmark
+def format_all_cells(sheet: Sheet):
+    sheet.format_all_cells()
+
+
+def save_size(path: str, named_styles: bool):
+    """
+    Formats the workbook at `path` and prints how long it took to save and
+    the resulting file size.
+    """
+    excel = Excel(path, use_logging=False)
+    sheet = Sheet(excel, "Name", "Data", options=OPTIONS, named_styles=named_styles)
+    format_all_cells(sheet)
+    start = time.perf_counter()
+    excel.save(use_print=False, backup=False)
+    elapsed = round(time.perf_counter() - start, 2)
+    size = os.path.getsize(path) / 1024
+    start = time.perf_counter()
+    Excel(path, use_logging=False)
+    load = round(time.perf_counter() - start, 2)
+    print(
+        f"named_styles={named_styles} Save: {elapsed}s Load: {load}s Size: {size:.0f} KB"
+    )
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        for named_styles in [False, True]:
+            path = os.path.join(tmp, f"bench_{named_styles}.xlsx")
+            make_workbook(path)
+            save_size(path, named_styles)
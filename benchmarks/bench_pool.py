@@ -0,0 +1,52 @@
+"""
+Compares running the same job over several workbooks one after another
+with process_workbooks.
+
+Run from the repo root with `python -m benchmarks.bench_pool`.
+"""
+
+import os, shutil, tempfile
+
+from easierexcel import Excel, Sheet, benchmark, process_workbooks
+from benchmarks.bench_index import make_workbook
+
+WORKBOOKS = 8
+ROWS = 10_000
+
+
+def job(sheet: Sheet):
+    """
+    Updates every tenth row and formats the sheet.
+    """
+    for row in range(0, ROWS, 10):
+        sheet.update_cell(f"Name {row}", "Age", 100)
+    sheet.format_all_cells()
+    return len(sheet.row_idx)
+
+
+@benchmark
+def serial(paths):
+    results = []
+    for path in paths:
+        with Excel(path, use_logging=False) as excel:
+            results.append(job(Sheet(excel, "Name", "Data")))
+            excel.save(use_print=False, backup=False)
+    return results
+
+
+@benchmark
+def pooled(paths):
+    results = process_workbooks(paths, job, "Name", "Data", backup=False)
+    return [result.result for result in results]
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.xlsx")
+        make_workbook(path, ROWS)
+        paths = []
+        for i in range(WORKBOOKS):
+            paths.append(os.path.join(tmp, f"bench_{i}.xlsx"))
+            shutil.copy(path, paths[-1])
+        print(f"{os.cpu_count()} cores")
+        assert serial(paths) == pooled(paths)
@@ -1,7 +1,18 @@
 from logging.handlers import RotatingFileHandler
 import logging as lg
-import shutil, os, sys, time, openpyxl, zipfile
-from openpyxl.styles import Border, Alignment, PatternFill, Font
+import shutil, os, re, sys, time, tempfile, threading, openpyxl, zipfile, weakref
+import json
+import datetime as dt
+from contextlib import contextmanager
+from openpyxl.styles import Border, Alignment, PatternFill, Font, Side, NamedStyle
+from openpyxl.styles.builtins import styles as builtin_styles
+from openpyxl.utils import get_column_letter, coordinate_to_tuple
+from collections.abc import Mapping, MutableMapping
+from collections import namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, wraps
+from copy import copy, deepcopy
+from bisect import bisect_right, insort
 from pathlib import Path
 import pandas as pd
 
@@ -22,6 +33,364 @@ def benchmark(func):
     return wrapped
 
 
+# shared log handlers by log file path as [handler, users]
+log_handlers = {}
+log_handlers_lock = threading.Lock()
+
+
+def add_log_handler(logger: lg.Logger, log_file: str):
+    """
+    Adds the handler for `log_file` to `logger` unless it was already added
+    and returns the full log file path used to remove it later.
+
+    Every Excel object logging to the same file shares one handler.
+    """
+    path = os.path.abspath(log_file)
+    with log_handlers_lock:
+        if path in log_handlers:
+            log_handlers[path][1] += 1
+            return path
+        datefmt = "%m-%d-%Y %I:%M:%S %p"
+        log_formatter = lg.Formatter(
+            "%(asctime)s %(levelname)s %(message)s", datefmt=datefmt
+        )
+        max_gigs = 2
+        my_handler = RotatingFileHandler(
+            path,
+            maxBytes=max_gigs * 1024 * 1024,
+            backupCount=2,
+        )
+        my_handler.setFormatter(log_formatter)
+        logger.addHandler(my_handler)
+        log_handlers[path] = [my_handler, 1]
+    return path
+
+
+def remove_log_handler(logger: lg.Logger, path: str):
+    """
+    Removes and closes the handler for `path` once nothing uses it anymore.
+    """
+    with log_handlers_lock:
+        if path not in log_handlers:
+            return
+        log_handlers[path][1] -= 1
+        if log_handlers[path][1] > 0:
+            return
+        handler = log_handlers.pop(path)[0]
+    logger.removeHandler(handler)
+    handler.close()
+
+
+def locked(method):
+    """
+    Runs the Sheet `method` while holding the workbook lock so background
+    saves never write a half finished change.
+
+    Reads using iter_rows, iter_cols or `cur_sheet.cell` need it too as
+    those add missing cells to the worksheet while it is being saved.
+    """
+
+    @wraps(method)
+    def wrapped(self, *args, **kwargs):
+        with self.excel.lock:
+            return method(self, *args, **kwargs)
+
+    return wrapped
+
+
+# every style a set of format actions applies to a cell
+StyleBundle = namedtuple(
+    "StyleBundle",
+    ["name", "style", "number_format", "date_format", "border", "alignment", "fill"],
+)
+
+
+@lru_cache(maxsize=None)
+def compile_style(actions: tuple):
+    """
+    Creates the StyleBundle for the format `actions` of a column.
+
+    Bundles are cached so each set of actions only creates its style
+    objects once.
+    """
+    style, number_format, date_format = None, None, None
+    if "percent" in actions:
+        style = "Percent"
+    elif "currency" in actions:
+        style = "Currency"
+    elif "integer" in actions:
+        number_format = "0"
+    elif "decimal" in actions:
+        # TODO add decimal increase/decrease
+        number_format = "#,#0.0"
+    elif "count_days" in actions:
+        number_format = '# "Days"'
+    else:
+        # only applied to cells that contain dates
+        date_format = "mm-dd-yy"
+    border = None
+    if "default_border" in actions:
+        side = Side(style="thin")
+        border = Border(left=side, right=side, top=side, bottom=side, outline=True)
+    alignment = None
+    for align in ["left", "center", "right"]:
+        if f"{align}_align" in actions:
+            alignment = Alignment(horizontal=align)
+            break
+    fill = None
+    if "black_fill" in actions:
+        fill = PatternFill(start_color="000000", end_color="000000", fill_type="solid")
+    elif "light_grey_fill" in actions:
+        fill = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
+    name = " ".join(actions)
+    return StyleBundle(name, style, number_format, date_format, border, alignment, fill)
+
+
+def freeze(value):
+    """
+    Turns the dictionaries, lists and sets within `value` into tuples so
+    it can be hashed.
+    """
+    if isinstance(value, dict):
+        return tuple((key, freeze(val)) for key, val in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(freeze(val) for val in value)
+    return value
+
+
+class FormatRules:
+    # number format categories in the order they are checked
+    categories = ["percent", "currency", "integer", "decimal", "count_days", "date"]
+    # categories that match part of a column name instead of all of it
+    partial_match = ["percent", "currency", "date", "black_fill", "light_grey_fill"]
+
+    def __init__(self, options: dict):
+        """
+        Compiled version of the formatting `options` used by
+        Sheet.format_picker.
+
+        Categories matching part of a column name are compiled into one case
+        insensitive regex and the rest into sets. The actions picked for
+        each column name are remembered.
+        """
+        self.default_align = options.get("default_align")
+        self.left_align = None
+        if "left_align" in options:
+            self.left_align = frozenset(options["left_align"])
+        self.right_align = None
+        if "right_align" in options:
+            self.right_align = frozenset(options["right_align"])
+        # only the first fill option given is used
+        self.fill = None
+        for fill in ["black_fill", "light_grey_fill"]:
+            if fill in options:
+                self.fill = (fill, self.compile(fill, options[fill]))
+                break
+        self.rules = {}
+        for category in self.categories:
+            if category in options:
+                self.rules[category] = self.compile(category, options[category])
+        self.actions = {}
+
+    def compile(self, category: str, names: list):
+        """
+        Compiles the `names` for `category` into a regex or a set.
+        """
+        if category not in self.partial_match:
+            return frozenset(names)
+        if not names:
+            return None
+        pattern = "|".join(re.escape(name) for name in names)
+        return re.compile(pattern, re.IGNORECASE)
+
+    @staticmethod
+    def matches(rule, column: str):
+        """
+        Returns True if `column` matches the compiled `rule`.
+        """
+        if rule is None:
+            return False
+        if isinstance(rule, frozenset):
+            return column in rule
+        return rule.search(str(column)) is not None
+
+    def pick(self, column: str):
+        """
+        Returns a tuple of the format actions for `column`.
+        """
+        if column in self.actions:
+            return self.actions[column]
+        actions = ["default_border"]
+        # alignment
+        alignment = self.default_align
+        if self.left_align is not None:
+            alignment = "left_align" if column in self.left_align else "center_align"
+        if self.right_align is not None:
+            alignment = "right_align" if column in self.right_align else "center_align"
+        if alignment:
+            actions.append(alignment)
+        # fill
+        if self.fill and self.matches(self.fill[1], column):
+            actions.append(self.fill[0])
+        # number format
+        for category, rule in self.rules.items():
+            if self.matches(rule, column):
+                actions.append(category)
+                break
+        self.actions[column] = tuple(actions)
+        return self.actions[column]
+
+
+@lru_cache(maxsize=None)
+def compile_format_rules(frozen_options: tuple):
+    """
+    Creates the FormatRules for options frozen with `freeze`.
+
+    Sheets with the same options share the same FormatRules.
+    """
+    options = {key: value for key, value in frozen_options}
+    return FormatRules(options)
+
+
+# first argument of a HYPERLINK formula as a double or single quoted string
+# or a cell reference such as B2, $B$2 or 'Other Sheet'!B2
+HYPERLINK_FORMULA = re.compile(
+    r"""HYPERLINK\(\s*(?:"([^"]*(?:""[^"]*)*)"|"""
+    r"""((?:'[^']*(?:''[^']*)*'!|[^\s,()'"!]+!)?\$?[A-Z]{1,3}\$?\d+)(?=\s*[,)])|"""
+    r"""'([^']*(?:''[^']*)*)')""",
+    re.IGNORECASE,
+)
+
+
+def parse_hyperlink(formula: str):
+    """
+    Returns the target of a HYPERLINK `formula`, a (sheet name, coordinate)
+    tuple if the target is in another cell or None if `formula` doesn't
+    contain a hyperlink. The sheet name is None for cells in the same sheet.
+    """
+    # plain =HYPERLINK("target", ...) formulas are read without the regex
+    if formula[:12].upper() == '=HYPERLINK("':
+        end = formula.find('"', 12)
+        if end != -1 and formula[end + 1 : end + 2] != '"':
+            return formula[12:end]
+    if not formula.lstrip().startswith("="):
+        return None
+    match = HYPERLINK_FORMULA.search(formula)
+    if not match:
+        return None
+    double_quoted, reference, single_quoted = match.groups()
+    if double_quoted is not None:
+        return double_quoted.replace('""', '"')
+    if single_quoted is not None:
+        return single_quoted.replace("''", "'")
+    sheet_name, _, coordinate = reference.rpartition("!")
+    if sheet_name.startswith("'"):
+        sheet_name = sheet_name[1:-1].replace("''", "'")
+    return (sheet_name or None, coordinate.replace("$", "").upper())
+
+
+# strings pandas.read_excel treats as N/A by default
+DEFAULT_NA_VALUES = frozenset(
+    [
+        "",
+        "#N/A",
+        "#N/A N/A",
+        "#NA",
+        "-1.#IND",
+        "-1.#QNAN",
+        "-NaN",
+        "-nan",
+        "1.#IND",
+        "1.#QNAN",
+        "<NA>",
+        "N/A",
+        "NA",
+        "NULL",
+        "NaN",
+        "None",
+        "n/a",
+        "nan",
+        "null",
+    ]
+)
+
+
+INDEX_CACHE_VERSION = 1
+
+# index keys are stored in the index cache as [type tag, JSON value]
+INDEX_KEY_TYPES = {
+    bool: "b",
+    int: "i",
+    float: "f",
+    str: "s",
+    dt.datetime: "dt",
+    dt.date: "d",
+    dt.time: "t",
+}
+
+
+def encode_index_key(value):
+    """
+    Returns `value` as a [type tag, JSON value] pair for the index cache.
+
+    Raises a TypeError for types that can't be stored.
+    """
+    tag = INDEX_KEY_TYPES.get(type(value))
+    if tag is None:
+        raise TypeError(f"{type(value).__name__} index keys can't be cached")
+    if tag in ("dt", "d", "t"):
+        return [tag, value.isoformat()]
+    return [tag, value]
+
+
+def decode_index_key(pair: list):
+    """
+    Returns the value of a [type tag, JSON value] pair from encode_index_key.
+
+    Raises a ValueError if the pair isn't valid.
+    """
+    tag, value = pair
+    if tag == "dt":
+        return dt.datetime.fromisoformat(value)
+    if tag == "d":
+        return dt.date.fromisoformat(value)
+    if tag == "t":
+        return dt.time.fromisoformat(value)
+    types = {"b": bool, "i": int, "f": float, "s": str}
+    if tag not in types or type(value) is not types[tag]:
+        # JSON has no separate float type for whole numbers
+        if not (tag == "f" and type(value) is int):
+            raise ValueError(f"Invalid index key {pair}")
+    return types[tag](value)
+
+
+def encode_index(index: dict):
+    """
+    Returns the `index` of keys and row or column numbers as a list of
+    [key pair, number] for the index cache.
+    """
+    return [[encode_index_key(key), number] for key, number in index.items()]
+
+
+def decode_index(entries: list):
+    """
+    Returns the index of an encode_index list.
+    """
+    index = {}
+    for pair, number in entries:
+        if type(number) is not int or number < 1:
+            raise ValueError(f"Invalid index number {number}")
+        index[decode_index_key(pair)] = number
+    return index
+
+
+class ReadOnlyError(Exception):
+    """
+    Raised when trying to change or save an Excel file that was opened
+    with `read_only` enabled.
+    """
+
+
 class Excel:
 
     changes_made = False
@@ -34,6 +403,12 @@ class Excel:
         use_logging: bool = True,
         log_file: str = "excel.log",
         log_level=lg.DEBUG,
+        read_only: bool = False,
+        atomic_save: bool = False,
+        save_every: int = None,
+        save_interval: float = None,
+        save_on_exit: bool = False,
+        index_cache: bool = False,
     ):
         """
         Allows retreiving, adding, updating, deleting and
@@ -47,11 +422,58 @@ class Excel:
 
         `log_level` Sets the logging level of this logger.
         level must be an int or a str.
+
+        `read_only` opens the workbook in openpyxl's streaming read-only mode.
+        This is much faster and lighter for large files but any attempt to
+        change or save the file will raise a ReadOnlyError.
+
+        `atomic_save` makes saves write to a temporary file that replaces the
+        excel file once it is complete so a crash can't corrupt it. The old
+        file is hard linked to the backup instead of being copied.
+
+        `save_every`, `save_interval` and `save_on_exit` set an auto save
+        policy for Sheet changes made with `save` set to True. Instead of
+        saving after every change, it saves once `save_every` changes were
+        made or `save_interval` seconds passed since the last save. There is
+        no timer, so `save_interval` is only checked when a change is made.
+        Changes still waiting are saved by flush and, only if `save_on_exit`
+        is True, when this object is closed or a `with` block using it ends
+        without an error. Otherwise closing logs a warning with the number of
+        save requests that were dropped.
+
+        `index_cache` keeps the row and column indexes of each Sheet in a
+        `.idx` file next to the excel file so they are loaded instead of
+        rebuilt while the excel file is unchanged. It is rewritten on save and
+        ignored once the excel file was changed by anything else.
         """
         # workbook setup
         self.file_path = Path(filename)
+        self.read_only = read_only
+        self.atomic_save = atomic_save
+        # auto save policy
+        self.save_every = save_every
+        self.save_interval = save_interval
+        self.save_on_exit = save_on_exit
+        self.requested_saves = 0
+        self.last_save = time.monotonic()
+        # sheets created from this workbook
+        self.open_sheets = weakref.WeakSet()
+        # held while the workbook is changed or written
+        self.lock = threading.RLock()
+        # background saves
+        self.save_executor = None
+        self.pending_save = None
+        self.pending_lock = threading.Lock()
+        # sidecar index cache
+        self.index_cache = index_cache
+        self.index_cache_path = Path(f"{self.file_path}.idx")
+        self.cached_indexes = None
+        self.file_key = self.get_file_key() if index_cache else None
+        # the cache file is written once at the end of a batch of Sheets
+        self.index_batch = 0
+        self.index_cache_pending = False
         try:
-            self.wb = openpyxl.load_workbook(self.file_path)
+            self.wb = openpyxl.load_workbook(self.file_path, read_only=read_only)
         except zipfile.BadZipFile:
             response = input(
                 f"Error with {self.file_path}.\nCheck backup to restore backup."
@@ -63,20 +485,12 @@ class Excel:
                 os.rename(f"{self.file_path}.bak", self.file_path)
         # logger setup
         self.use_logging = use_logging
-        datefmt = "%m-%d-%Y %I:%M:%S %p"
-        log_formatter = lg.Formatter(
-            "%(asctime)s %(levelname)s %(message)s", datefmt=datefmt
-        )
         self.logger = lg.getLogger(__name__)
         self.logger.setLevel(log_level)  # Log Level
-        max_gigs = 2
-        my_handler = RotatingFileHandler(
-            log_file,
-            maxBytes=max_gigs * 1024 * 1024,
-            backupCount=2,
-        )
-        my_handler.setFormatter(log_formatter)
-        self.logger.addHandler(my_handler)
+        self.log_file = None
+        if use_logging:
+            self.log_file = add_log_handler(self.logger, log_file)
+        self.closed = False
 
     def log(self, msg: str, type: str = "info"):
         """
@@ -90,6 +504,16 @@ class Excel:
             if type == "error":
                 self.logger.error(msg)
 
+    def check_writable(self, action: str = "save"):
+        """
+        Raises a ReadOnlyError naming the `action` if the workbook was opened
+        in read-only mode.
+        """
+        if self.read_only:
+            name = self.file_path.name
+            msg = f"{action} can't be used on {name} as it was opened read-only"
+            raise ReadOnlyError(msg)
+
     def save(
         self,
         use_print: bool = True,
@@ -106,16 +530,10 @@ class Excel:
         It will keep trying to save until it completes in case of permission
         errors caused by the file being open.
         """
+        self.check_writable()
         # only saves if any changes were made
         if self.changes_made or force_save:
             try:
-                # backups the file before saving.
-                if backup:
-                    if not self.backed_up:
-                        backup_path = f"{self.file_path}.bak"
-                        shutil.copy(self.file_path, backup_path)
-                        self.backed_up = True
-                        self.log(f"Excel file backed up", "info")
                 # saves the file once it is closed
                 if use_print:
                     print("\nSaving...")
@@ -123,10 +541,9 @@ class Excel:
                 while True:
                     try:
                         if self.file_path.exists:
-                            self.wb.save(self.file_path)
+                            self.write_file(backup)
                             if use_print:
                                 print(f'Save Complete.{34*" "}')
-                                self.changes_made = False
                             return True
                         else:
                             print("File no longer exists. Save Cancelled")
@@ -149,6 +566,392 @@ class Excel:
                 self.logger.info(msg)
                 print(msg)
 
+    def write_file(self, backup: bool = True):
+        """
+        Writes the workbook to the excel file and resets the change tracking
+        of the workbook and its sheets.
+
+        Backs up the excel file first if `backup` is True and it was not
+        backed up yet.
+        """
+        with self.lock:
+            backup = backup and not self.backed_up
+            if self.atomic_save:
+                self.save_atomic(backup)
+            else:
+                if backup:
+                    backup_path = f"{self.file_path}.bak"
+                    shutil.copy(self.file_path, backup_path)
+                    self.backed_up = True
+                    self.log(f"Excel file backed up", "info")
+                self.wb.save(self.file_path)
+            for sheet in self.open_sheets:
+                sheet.clear_caches()
+                sheet.clear_dirty()
+            self.changes_made = False
+            if self.index_cache:
+                self.file_key = self.get_file_key()
+                self.cached_indexes = {}
+                for sheet in self.open_sheets:
+                    self.add_cached_index(sheet, rebuild=True)
+                self.write_index_cache()
+            self.requested_saves = 0
+            self.last_save = time.monotonic()
+
+    def get_file_key(self):
+        """
+        Returns the path, modification time and size that identify the
+        current version of the excel file.
+        """
+        stat = os.stat(self.file_path)
+        return (str(self.file_path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+    def load_index_cache(self):
+        """
+        Loads the indexes in the index cache file if it was written for this
+        version of the excel file.
+
+        The file is plain JSON and anything unexpected in it makes it be
+        ignored.
+        """
+        self.cached_indexes = {}
+        try:
+            with open(self.index_cache_path, encoding="utf-8") as file:
+                cache = json.load(file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            self.log("Index cache could not be read", "warning")
+            return
+        try:
+            if cache["version"] != INDEX_CACHE_VERSION:
+                return
+            if tuple(cache["file_key"]) != self.file_key:
+                return
+            indexes = {}
+            for entry in cache["indexes"]:
+                key = (entry["sheet"], decode_index_key(entry["column"]))
+                if type(key[0]) is not str:
+                    raise ValueError("Sheet name is not a string")
+                indexes[key] = (
+                    decode_index(entry["col_idx"]),
+                    decode_index(entry["row_idx"]),
+                )
+        except (TypeError, ValueError, KeyError, IndexError):
+            self.log("Index cache is not valid", "warning")
+            return
+        self.cached_indexes = indexes
+
+    def get_cached_index(self, sheet_name: str, column_name: str):
+        """
+        Returns the cached (col_idx, row_idx) of `sheet_name` indexed by
+        `column_name` or None if it isn't cached or the workbook has unsaved
+        changes the cache doesn't include.
+        """
+        with self.lock:
+            if self.changes_made:
+                return None
+            if self.cached_indexes is None:
+                self.load_index_cache()
+            return self.cached_indexes.get((sheet_name, column_name))
+
+    def add_cached_index(self, sheet, rebuild: bool = False):
+        """
+        Adds the indexes of `sheet` to the cached indexes unless they have
+        keys that can't be stored.
+
+        `rebuild` reads the indexes from the worksheet instead, as changes
+        such as renaming a key don't update the sheet's indexes.
+        """
+        state = sheet.index_state(rebuild)
+        if state is None:
+            return False
+        col_idx, row_idx = state
+        try:
+            encode_index_key(sheet.column_name)
+            encode_index(col_idx)
+            encode_index(row_idx)
+        except TypeError:
+            return False
+        self.cached_indexes[sheet.index_key] = (col_idx, row_idx)
+        return True
+
+    def store_index(self, sheet):
+        """
+        Adds the indexes of `sheet` to the index cache file if the workbook
+        still matches the excel file.
+
+        Within batch_index_cache the file is only written once at the end.
+        """
+        with self.lock:
+            if self.changes_made or self.file_key != self.get_file_key():
+                return
+            if self.cached_indexes is None:
+                self.load_index_cache()
+            if not self.add_cached_index(sheet):
+                return
+            if self.index_batch:
+                self.index_cache_pending = True
+            else:
+                self.write_index_cache()
+
+    @contextmanager
+    def batch_index_cache(self):
+        """
+        Writes the index cache file once for every Sheet created within the
+        `with` block instead of once per Sheet.
+        """
+        with self.lock:
+            self.index_batch += 1
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.index_batch -= 1
+                if not self.index_batch and self.index_cache_pending:
+                    self.write_index_cache()
+
+    def write_index_cache(self):
+        """
+        Writes the index cache file through a temporary file so a partly
+        written cache is never read.
+        """
+        self.index_cache_pending = False
+        cache = {
+            "version": INDEX_CACHE_VERSION,
+            "file_key": list(self.file_key),
+            "indexes": [
+                {
+                    "sheet": sheet_name,
+                    "column": encode_index_key(column_name),
+                    "col_idx": encode_index(col_idx),
+                    "row_idx": encode_index(row_idx),
+                }
+                for (sheet_name, column_name), (col_idx, row_idx) in (
+                    self.cached_indexes.items()
+                )
+            ],
+        }
+        directory = self.index_cache_path.parent
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as file:
+                    json.dump(cache, file)
+                os.replace(temp_path, self.index_cache_path)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+        except OSError:
+            self.log("Index cache could not be written", "warning")
+
+    def request_save(self):
+        """
+        Used by Sheet changes made with `save` set to True.
+
+        Saves right away unless an auto save policy was set, in which case
+        it only saves once the policy says a save is due. Returns True if it
+        saved.
+        """
+        self.changes_made = True
+        policy = [self.save_every, self.save_interval, self.save_on_exit]
+        if not any(policy):
+            return bool(self.save(use_print=False, backup=False))
+        self.requested_saves += 1
+        due = self.save_every and self.requested_saves >= self.save_every
+        if self.save_interval is not None:
+            waited = time.monotonic() - self.last_save
+            due = due or waited >= self.save_interval
+        if due:
+            return bool(self.save(use_print=False, backup=False))
+        return False
+
+    def flush(self):
+        """
+        Saves any changes the auto save policy is still holding back.
+        """
+        if self.requested_saves:
+            self.save(use_print=False, backup=False)
+
+    def close(self, save: bool = True):
+        """
+        Saves changes the auto save policy is still holding back if `save`
+        and `save_on_exit` are True, waits for background saves to finish and
+        then releases the workbook and the log handler.
+
+        Changes still held back that are not saved are logged as a warning.
+        """
+        if self.closed:
+            return
+        try:
+            if save and self.save_on_exit and not self.read_only:
+                self.flush()
+            elif self.requested_saves:
+                msg = f"Closed without saving {self.requested_saves} save requests"
+                self.log(msg, "warning")
+        finally:
+            if self.save_executor is not None:
+                self.save_executor.shutdown(wait=True)
+                self.save_executor = None
+            self.wb.close()
+            if self.log_file:
+                remove_log_handler(self.logger, self.log_file)
+                self.log_file = None
+            self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # changes from a block that failed part way are never saved
+        self.close(save=exc_type is None)
+
+    def sheets(
+        self,
+        column_name,
+        sheet_names: list = None,
+        lazy: bool = False,
+        **sheet_kwargs,
+    ):
+        """
+        Creates a Sheet for each name in `sheet_names` and returns them in a
+        SheetMap by sheet name.
+
+        `column_name` is either the column name used by every sheet or a dict
+        of column names by sheet name. `sheet_names` defaults to the keys of
+        that dict or to every sheet in the workbook.
+
+        If `lazy` is True each Sheet is only created and indexed the first
+        time it is accessed. Otherwise they are all created now.
+
+        `sheet_kwargs` are passed to every Sheet.
+        """
+        if isinstance(column_name, dict):
+            column_names = column_name
+            if sheet_names is None:
+                sheet_names = list(column_names)
+        else:
+            if sheet_names is None:
+                sheet_names = self.wb.sheetnames
+            column_names = {name: column_name for name in sheet_names}
+        for name in sheet_names:
+            if name not in self.wb.sheetnames:
+                raise KeyError(f"{name} is not a sheet in {self.file_path.name}")
+        sheets = SheetMap(self, column_names, sheet_names, sheet_kwargs)
+        if not lazy:
+            sheets.build_all()
+        return sheets
+
+    def save_async(self, backup: bool = True, retries: int = 5, backoff: float = 0.5):
+        """
+        Saves the excel file on a background thread and returns a Future
+        that is done once the save finishes or fails.
+
+        Saves requested before the previous one started are combined into
+        one save of the latest changes. Use `asyncio.wrap_future` to await
+        the Future.
+
+        The save holds the workbook lock the whole time it writes the file,
+        so anything that changes the workbook and reads such as get_row and
+        create_dataframe wait until it is done. Only reads that don't lock,
+        like get_cell and read_cells, keep running during the save.
+
+        Backs up the excel file before saving the changes if `backup` is True.
+
+        Permission errors caused by the file being open are retried up to
+        `retries` times, waiting `backoff` seconds at first and twice as
+        long after each try.
+        """
+        self.check_writable()
+        with self.pending_lock:
+            if self.pending_save is not None:
+                return self.pending_save
+            future = Future()
+            self.pending_save = future
+            if self.save_executor is None:
+                self.save_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="easierexcel-save"
+                )
+        self.save_executor.submit(
+            self.background_save, future, backup, retries, backoff
+        )
+        return future
+
+    def background_save(
+        self, future: Future, backup: bool, retries: int, backoff: float
+    ):
+        """
+        Runs a save started by save_async and sets the result of `future`.
+        """
+        with self.pending_lock:
+            self.pending_save = None
+        if not future.set_running_or_notify_cancel():
+            return
+        delay = backoff
+        for attempt in range(retries + 1):
+            try:
+                self.write_file(backup)
+                future.set_result(True)
+                return
+            except PermissionError as error:
+                if attempt == retries:
+                    self.log(f"Background save failed: {error}", "error")
+                    future.set_exception(error)
+                    return
+                time.sleep(delay)
+                delay *= 2
+            except Exception as error:
+                self.log(f"Background save failed: {error}", "error")
+                future.set_exception(error)
+                return
+
+    def save_atomic(self, backup: bool = True):
+        """
+        Writes the workbook to a temporary file in the same folder and then
+        replaces the excel file with it.
+
+        The current excel file is hard linked, or copied where links aren't
+        supported, to the backup first if `backup` is True so the excel file
+        always exists. The temporary file gets the excel file's permissions.
+        """
+        fd, temp_path = tempfile.mkstemp(
+            prefix=f".{self.file_path.name}.",
+            suffix=".tmp",
+            dir=self.file_path.parent,
+        )
+        try:
+            with os.fdopen(fd, "wb") as file:
+                self.wb.save(file)
+                file.flush()
+                os.fsync(file.fileno())
+            if self.file_path.exists():
+                shutil.copymode(self.file_path, temp_path)
+                if backup:
+                    backup_path = f"{self.file_path}.bak"
+                    if os.path.exists(backup_path):
+                        os.remove(backup_path)
+                    try:
+                        os.link(self.file_path, backup_path)
+                    except OSError:
+                        shutil.copy2(self.file_path, backup_path)
+                    self.backed_up = True
+                    self.log(f"Excel file backed up", "info")
+            os.replace(temp_path, self.file_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        # makes sure the rename itself is on disk where folders can be synced
+        try:
+            dir_fd = os.open(self.file_path.parent, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
     def open_excel(self, save: bool = True):
         """
         Opens the current excel file if it still exists and then exits.
@@ -180,6 +983,168 @@ class Excel:
         self.open_excel()
 
 
+class RowIndex(MutableMapping):
+    def __init__(self, rows: dict = None):
+        """
+        Maps row keys to their row number within a sheet.
+
+        `rows` sets the starting keys and row numbers.
+
+        Deleted rows are only recorded, the rows below them are shifted up
+        when they are looked up instead of rewriting every entry.
+        """
+        # row numbers as they were before any rows were deleted
+        self.base = dict(rows) if rows else {}
+        # sorted base row numbers of deleted rows
+        self.deleted = []
+
+    def to_row(self, base: int):
+        """
+        Converts a `base` row number into the current row number.
+        """
+        if not self.deleted:
+            return base
+        return base - bisect_right(self.deleted, base)
+
+    def to_base(self, row: int):
+        """
+        Converts a current `row` number into its base row number.
+        """
+        if not self.deleted:
+            return row
+        # smallest base with `row` rows left at or above it
+        low, high = row, row + len(self.deleted)
+        while low < high:
+            mid = (low + high) // 2
+            if mid - bisect_right(self.deleted, mid) < row:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def remove_rows(self, rows: list):
+        """
+        Shifts every entry below the deleted current `rows` up.
+
+        Keys that pointed at the deleted rows must be removed separately.
+        """
+        self.deleted.extend([self.to_base(row) for row in rows])
+        self.deleted.sort()
+        # folds the offsets back in once they outnumber the keys
+        if len(self.deleted) > max(len(self.base), 64):
+            self.compact()
+
+    def compact(self):
+        """
+        Rewrites every base row number to its current row number.
+        """
+        self.base = {key: self.to_row(base) for key, base in self.base.items()}
+        self.deleted = []
+
+    def __getitem__(self, key):
+        return self.to_row(self.base[key])
+
+    def __setitem__(self, key, row: int):
+        self.base[key] = self.to_base(row)
+
+    def __delitem__(self, key):
+        del self.base[key]
+
+    def __contains__(self, key):
+        return key in self.base
+
+    def __iter__(self):
+        return iter(self.base)
+
+    def __len__(self):
+        return len(self.base)
+
+    def items(self):
+        # base row numbers are current until a row is deleted
+        if not self.deleted:
+            return self.base.items()
+        return super().items()
+
+    def __repr__(self):
+        return f"RowIndex({dict(self.items())})"
+
+
+class SecondaryIndex(RowIndex):
+    def __init__(self, columns: tuple):
+        """
+        Maps the values of `columns` to the list of row numbers that have
+        them. Single column indexes are keyed by the value and composite
+        indexes by a tuple of values.
+
+        Row numbers are kept the same way as in RowIndex so deleted rows only
+        shift the rows below them when they are looked up.
+        """
+        super().__init__()
+        self.columns = columns
+        # key of each base row number
+        self.row_keys = {}
+
+    def add(self, key, row: int):
+        """
+        Adds `row` to the rows of `key`.
+        """
+        base = self.to_base(row)
+        insort(self.base.setdefault(key, []), base)
+        self.row_keys[base] = key
+
+    def discard_row(self, row: int):
+        """
+        Removes `row` from the rows of whatever key it had.
+        """
+        base = self.to_base(row)
+        if base not in self.row_keys:
+            return
+        key = self.row_keys.pop(base)
+        bases = self.base[key]
+        bases.remove(base)
+        if not bases:
+            del self.base[key]
+
+    def remove_rows(self, rows: list):
+        """
+        Removes the deleted current `rows` and shifts every row below them up.
+        """
+        for row in rows:
+            self.discard_row(row)
+        super().remove_rows(rows)
+
+    def compact(self):
+        self.base = {
+            key: [self.to_row(base) for base in bases]
+            for key, bases in self.base.items()
+        }
+        self.row_keys = {
+            base: key for key, bases in self.base.items() for base in bases
+        }
+        self.deleted = []
+
+    def __getitem__(self, key):
+        return [self.to_row(base) for base in self.base[key]]
+
+    def __setitem__(self, key, rows: list):
+        if key in self.base:
+            del self[key]
+        for row in rows:
+            self.discard_row(row)
+            self.add(key, row)
+
+    def __delitem__(self, key):
+        for base in self.base.pop(key):
+            del self.row_keys[base]
+
+    def items(self):
+        # row lists are built on lookup so RowIndex's shortcut can't be used
+        return MutableMapping.items(self)
+
+    def __repr__(self):
+        return f"SecondaryIndex({self.columns}, {dict(self.items())})"
+
+
 class Sheet:
     def __init__(
         self,
@@ -187,6 +1152,7 @@ class Sheet:
         column_name: str,
         sheet_name: str = None,
         options: dict = None,
+        named_styles: bool = False,
     ) -> None:
         """
         Allows interacting with any one sheet within the excel_object given.
@@ -199,6 +1165,10 @@ class Sheet:
         `sheet_name` Name of the sheet to use.
 
         `options` used to determine auto formatting.
+
+        `named_styles` makes formatting register one named style for each
+        column format and apply it to the whole column instead of styling
+        each cell on its own.
         """
         self.wb = excel_object.wb
         self.excel = excel_object
@@ -213,14 +1183,46 @@ class Sheet:
             else:
                 raise "No sheets exist."
         self.column_name = column_name
+        # read-only sheets are streamed once and their values kept for lookups
+        self.read_only = excel_object.read_only
+        self.rows = None
+        if self.read_only:
+            self.rows = self.load_rows()
         # column and row indexes
-        self.col_idx = self.get_column_index()
-        self.row_idx = self.get_row_index(self.column_name)
+        cached = None
+        if excel_object.index_cache:
+            cached = excel_object.get_cached_index(*self.index_key)
+        if cached:
+            col_idx, row_idx = cached
+            self.col_idx = dict(col_idx)
+            self.row_idx = RowIndex(dict(row_idx))
+        else:
+            self.col_idx = self.get_column_index()
+            self.row_idx = RowIndex(self.get_row_index(self.column_name))
+            if excel_object.index_cache:
+                excel_object.store_index(self)
+        # secondary indexes by their column names
+        self.indexes = {}
         # error checking
         self.missing_columns = []
+        # dataframes by create_dataframe arguments
+        self.df_cache = {}
+        self.df_cache_hits = 0
+        self.df_cache_misses = 0
+        # column values by column name for select and query
+        self.column_cache = {}
         # formatting init
         # column format actions init
         self.column_formats = None
+        self.column_styles = None
+        self.named_styles = named_styles
+        # finished cell styles by StyleBundle id and starting style
+        self.style_cache = {}
+        # hyperlinks by (row, column) of their cell
+        self.hyperlink_cache = {}
+        # rows and column names changed since the last format or save
+        self.dirty_rows = set()
+        self.dirty_columns = set()
         # options
         self.options = options
         if not self.options:
@@ -238,23 +1240,319 @@ class Sheet:
                 "decimal": ["Hours"],
                 "not_centered": ["Name"],
             }
+        # options used the last time all cells were formatted
+        self.formatted_options = deepcopy(self.options)
+        # added last so saves and other sheets only see finished sheets
+        self.excel.open_sheets.add(self)
+
+    @property
+    def index_key(self):
+        """
+        Key of this sheet's indexes in the index cache.
+        """
+        return (self.cur_sheet.title, self.column_name)
 
-    def create_dataframe(self, date_cols: list = None, na_vals: list = None):
+    def index_state(self, rebuild: bool = False):
+        """
+        Returns copies of the column and row indexes for the index cache.
+
+        `rebuild` reads them from the worksheet instead. None is returned if
+        the column_name column was renamed or moved.
+        """
+        if not rebuild:
+            return (dict(self.col_idx), dict(self.row_idx))
+        col_idx = self.get_column_index()
+        column = self.col_idx.get(self.column_name)
+        if column is None or col_idx.get(self.column_name) != column:
+            return None
+        return (col_idx, self.get_row_index(self.column_name))
+
+    @locked
+    def create_dataframe(
+        self,
+        date_cols: list = None,
+        na_vals: list = None,
+        keep_default_na: bool = True,
+    ):
         """
         Creates a panda dataframe using the current used sheet.
 
+        It is created from the workbook in memory with the column index as
+        the header, so changes that are not saved yet are included.
+
         `date_cols` sets the columns with dates.
 
         `na_vals` sets what should be considered N/A values that are ignored.
+
+        `keep_default_na` also treats the strings pandas.read_excel considers
+        N/A by default, such as "N/A", "#N/A" and "null", as N/A values.
+
+        Blank rows at the end of the sheet are left out like read_excel does.
+
+        Dataframes are cached by their arguments until the sheet is changed
+        or saved.
         """
-        df = pd.read_excel(
-            self.excel.file_path,
-            engine="openpyxl",
-            sheet_name=self.sheet_name,
-            parse_dates=date_cols,
-            na_values=na_vals,
-        )
-        return df
+        key = (tuple(date_cols or ()), frozenset(na_vals or ()), keep_default_na)
+        if key in self.df_cache:
+            self.df_cache_hits += 1
+            return self.df_cache[key].copy()
+        self.df_cache_misses += 1
+        na_vals = {"", *(na_vals or ())}
+        if keep_default_na:
+            na_vals.update(DEFAULT_NA_VALUES)
+        width = max(self.col_idx.values(), default=0)
+        if self.read_only:
+            rows = self.rows[1:]
+        else:
+            rows = list(
+                self.cur_sheet.iter_rows(min_row=2, max_col=width, values_only=True)
+            )
+        data = {}
+        for column, col_i in self.col_idx.items():
+            values = [row[col_i - 1] if col_i <= len(row) else None for row in rows]
+            data[column] = [None if val in na_vals else val for val in values]
+        # trims the blank rows at the end
+        length = len(rows)
+        while length and all(values[length - 1] is None for values in data.values()):
+            length -= 1
+        df = pd.DataFrame({column: values[:length] for column, values in data.items()})
+        for column in date_cols or []:
+            df[column] = pd.to_datetime(df[column])
+        self.df_cache[key] = df
+        return df.copy()
+
+    @locked
+    def get_column_values(self, columns: list):
+        """
+        Returns a dataframe with the values of `columns` indexed by row
+        number.
+
+        Each column is read from the worksheet once and cached until the sheet
+        is changed or saved.
+        """
+        for column in columns:
+            if column in self.column_cache:
+                continue
+            if column not in self.col_idx:
+                raise KeyError(f"{column} is not a column in {self.sheet_name}")
+            col_i = self.col_idx[column]
+            if self.read_only:
+                rows = self.rows[1:]
+                values = [row[col_i - 1] if col_i <= len(row) else None for row in rows]
+            else:
+                cols = self.cur_sheet.iter_cols(
+                    min_col=col_i,
+                    max_col=col_i,
+                    min_row=2,
+                    values_only=True,
+                )
+                values = next(cols, ())
+            values = [None if val == "" else val for val in values]
+            index = pd.RangeIndex(2, len(values) + 2)
+            series = pd.Series(values, index=index, dtype=object)
+            self.column_cache[column] = series.infer_objects()
+        return pd.DataFrame({column: self.column_cache[column] for column in columns})
+
+    def select(self, columns: list = None, where=None):
+        """
+        Returns a dataframe with the values of `columns` indexed by the
+        `column_name` value of each row where `where` is True.
+
+        `columns` defaults to every column.
+
+        `where` can be a pandas query string such as "Age > 30", with column
+        names containing spaces in backticks, or a function that is given the
+        dataframe of every column and returns a boolean mask. Every row is
+        selected if it is None.
+        """
+        if columns is None:
+            columns = list(self.col_idx)
+        if where is None:
+            needed = []
+        elif isinstance(where, str):
+            needed = [column for column in self.col_idx if str(column) in where]
+        else:
+            needed = list(self.col_idx)
+        needed = list(dict.fromkeys([self.column_name, *columns, *needed]))
+        df = self.get_column_values(needed)
+        # rows without a key can't be looked up
+        df = df[df[self.column_name].notna()]
+        if isinstance(where, str):
+            df = df.query(where)
+        elif where is not None:
+            df = df[where(df)]
+        return df.set_index(self.column_name, drop=False)[columns]
+
+    def query(self, where):
+        """
+        Returns the `column_name` values of the rows where `where` is True.
+
+        `where` is used the same way as in select.
+        """
+        return self.select([self.column_name], where).index.tolist()
+
+    @locked
+    def write_dataframe(
+        self, df: pd.DataFrame, save: bool = False, clear_empty: bool = False
+    ):
+        """
+        Writes `df` back into the sheet using its column_name column, or its
+        index if it is named after the column_name, to find each row.
+
+        Existing rows are written one column at a time and rows with new
+        values in the column_name column are added as new lines. Columns
+        not in the sheet are skipped.
+
+        Empty values in existing rows are skipped like in update_cells so
+        text that create_dataframe reads as NaN, such as "N/A", is kept.
+        Set `clear_empty` to True to clear those cells instead.
+
+        Returns a dictionary with the number of "updated" cells and
+        "added" lines.
+
+        Saves once after all changes if `save` is True.
+        """
+        self.excel.check_writable("write_dataframe")
+        if self.column_name not in df.columns:
+            if df.index.name != self.column_name:
+                raise ValueError(f"{self.column_name} column was not given.")
+            df = df.reset_index()
+        df = df.astype(object).where(df.notna(), None)
+        keys = df[self.column_name].tolist()
+        existing, new = [], []
+        for i, key in enumerate(keys):
+            (existing if key in self.row_idx else new).append(i)
+        rows = [self.row_idx[keys[i]] for i in existing]
+        updated = 0
+        for column in df.columns:
+            if column == self.column_name or column not in self.col_idx:
+                continue
+            col_i = self.col_idx[column]
+            values = df[column].tolist()
+            for row, i in zip(rows, existing):
+                if values[i] is None and not clear_empty:
+                    continue
+                if self.write_cell(row, col_i, values[i]):
+                    self.dirty_columns.add(column)
+                    updated += 1
+        added = self.add_new_lines(df.iloc[new]) if new else 0
+        if updated or added:
+            if save:
+                self.excel.request_save()
+            else:
+                self.excel.changes_made = True
+        return {"updated": updated, "added": added}
+
+    @locked
+    def upsert(self, records, replace: bool = True, save: bool = False):
+        """
+        Merges `records` into the sheet by their `column_name` value.
+
+        `records` is an iterable of dictionaries like the ones used by
+        add_new_line. Records for existing rows only write the cells that
+        changed and the rest are added as new lines all at once. Later
+        records for the same new key are merged into one line.
+
+        `replace` works the same as in update_cell for every cell.
+
+        Returns a dictionary with the number of "inserted", "updated" and
+        "unchanged" records.
+
+        Saves once after all changes if `save` is True.
+        """
+        self.excel.check_writable("upsert")
+        records = list(records)
+        for record in records:
+            if record.get(self.column_name) in (None, ""):
+                raise ValueError("column_name value was not given.")
+        get_cell = self.cur_sheet._cells.get
+        columns_by_keys = {}
+        new_lines = {}
+        updated, unchanged = 0, 0
+        for record in records:
+            key = record[self.column_name]
+            if key in new_lines:
+                new_lines[key].update(record)
+                continue
+            if key not in self.row_idx:
+                new_lines[key] = dict(record)
+                continue
+            row = self.row_idx[key]
+            record_keys = tuple(record)
+            if record_keys not in columns_by_keys:
+                mapping = self.get_line_mapping(record_keys)
+                columns_by_keys[record_keys] = [
+                    (record_keys[i], col_i + 1) for i, col_i in mapping
+                ]
+            changed = False
+            for column, col_i in columns_by_keys[record_keys]:
+                if column == self.column_name:
+                    continue
+                # unchanged cells are skipped without going through write_cell
+                cell = get_cell((row, col_i))
+                cur_val = None if cell is None else cell.value
+                new_val = record[column]
+                if cur_val == (None if new_val == "" else new_val):
+                    continue
+                if self.write_cell(row, col_i, new_val, replace):
+                    changed = True
+            if changed:
+                updated += 1
+            else:
+                unchanged += 1
+        inserted = self.add_new_lines(new_lines.values()) if new_lines else 0
+        if updated or inserted:
+            if save:
+                self.excel.request_save()
+            else:
+                self.excel.changes_made = True
+        return {"inserted": inserted, "updated": updated, "unchanged": unchanged}
+
+    def shared_sheets(self):
+        """
+        Returns every open Sheet on the same worksheet, including this one.
+        """
+        sheets = [
+            sheet
+            for sheet in self.excel.open_sheets
+            if sheet.cur_sheet is self.cur_sheet
+        ]
+        return sheets or [self]
+
+    def clear_caches(self):
+        """
+        Clears everything cached from the sheet values after a change.
+
+        Other open Sheets on the same worksheet are cleared as well, along
+        with their hyperlinks, since they read the same cells.
+        """
+        for sheet in self.shared_sheets():
+            sheet.df_cache.clear()
+            sheet.column_cache.clear()
+            if sheet is not self:
+                sheet.hyperlink_cache.clear()
+
+    def clear_dirty(self):
+        """
+        Forgets which rows and columns changed since the last format or save.
+        """
+        self.dirty_rows.clear()
+        self.dirty_columns.clear()
+
+    def remove_dirty_rows(self, rows: list):
+        """
+        Removes the deleted `rows` from the dirty rows and shifts the dirty
+        rows below them up.
+        """
+        if not self.dirty_rows:
+            return
+        deleted = set(rows)
+        rows = sorted(deleted)
+        self.dirty_rows = {
+            row - bisect_right(rows, row)
+            for row in self.dirty_rows
+            if row not in deleted
+        }
 
     @staticmethod
     def indirect_cell(left: int = 0, right: int = 0, manual_set: int = 0):
@@ -290,30 +1588,132 @@ class Sheet:
         diff = self.col_idx[ref_col] - self.col_idx[cur_col]
         return self.indirect_cell(manual_set=diff)
 
+    def load_rows(self):
+        """
+        Reads all row values of a read-only sheet in a single streaming pass.
+        """
+        return list(self.cur_sheet.iter_rows(values_only=True))
+
+    @locked
     def get_column_index(self):
         """
-        Creates the column index.
+        Creates the column index from the header row.
         """
+        if self.read_only:
+            header = self.rows[0] if self.rows else ()
+        else:
+            rows = self.cur_sheet.iter_rows(max_row=1, values_only=True)
+            header = next(rows, ())
         col_index = {}
-        for i in range(1, len(self.cur_sheet["1"]) + 1):
-            title = self.cur_sheet.cell(row=1, column=i).value
+        for i, title in enumerate(header, start=1):
             if title is not None:
                 col_index[title] = i
         return col_index
 
+    @locked
     def get_row_index(self, col_name: str):
         """
         Creates the row index based on `col_name`.
+
+        Only the cells of `col_name` are read, in a single `values_only` sweep.
         """
+        column = self.col_idx[col_name]
+        if self.read_only:
+            titles = [r[column - 1] if column <= len(r) else None for r in self.rows]
+            titles = titles[1:]
+        else:
+            cols = self.cur_sheet.iter_cols(
+                min_col=column,
+                max_col=column,
+                min_row=2,
+                values_only=True,
+            )
+            titles = next(cols, ())
         row_idx = {}
-        total_rows = len(self.cur_sheet["A"])
-        for row in range(1, total_rows):
-            column = self.col_idx[col_name]
-            title = self.cur_sheet.cell(row=row + 1, column=column).value
+        for row, title in enumerate(titles, start=2):
             if title is not None:
-                row_idx[title] = row + 1
+                row_idx[title] = row
         return row_idx
 
+    @staticmethod
+    def index_columns(columns):
+        """
+        Returns `columns` as a tuple of column names.
+        """
+        if isinstance(columns, (list, tuple)):
+            return tuple(columns)
+        return (columns,)
+
+    @staticmethod
+    def secondary_key(values: tuple):
+        """
+        Returns the secondary index key for the `values` of its columns or
+        None if every value is blank.
+        """
+        values = tuple(None if value == "" else value for value in values)
+        if all(value is None for value in values):
+            return None
+        return values[0] if len(values) == 1 else values
+
+    def row_secondary_key(self, index: SecondaryIndex, row: int):
+        """
+        Returns the key `row` has within `index`.
+        """
+        values = (
+            self.read_cells([row], self.col_idx[column])[0] for column in index.columns
+        )
+        return self.secondary_key(tuple(values))
+
+    @locked
+    def get_index(self, columns):
+        """
+        Returns the SecondaryIndex for `columns`, building it the first time.
+
+        `columns` is a column name or a list of column names for a composite
+        key. Rows with duplicate keys are all kept.
+
+        The index is kept up to date by changes made through this Sheet.
+        """
+        columns = self.index_columns(columns)
+        if columns in self.indexes:
+            return self.indexes[columns]
+        for column in columns:
+            if column not in self.col_idx:
+                raise KeyError(f"{column} is not a column in {self.sheet_name}")
+        positions = [self.col_idx[column] - 1 for column in columns]
+        if self.read_only:
+            rows = self.rows[1:]
+        else:
+            rows = self.cur_sheet.iter_rows(
+                min_row=2,
+                max_col=max(positions) + 1,
+                values_only=True,
+            )
+        index = SecondaryIndex(columns)
+        for row, values in enumerate(rows, start=2):
+            values = tuple(values[i] if i < len(values) else None for i in positions)
+            key = self.secondary_key(values)
+            if key is not None:
+                index.add(key, row)
+        self.indexes[columns] = index
+        return index
+
+    def find_rows(self, columns, key):
+        """
+        Returns the row numbers where `columns` have the value `key`.
+
+        `key` is a tuple of values when `columns` is a list of column names.
+        """
+        return self.get_index(columns).get(key, [])
+
+    def find(self, columns, key):
+        """
+        Returns the `column_name` values of the rows where `columns` have the
+        value `key` so they can be used with get_cell or update_cell.
+        """
+        key_col = self.col_idx[self.column_name]
+        return self.read_cells(self.find_rows(columns, key), key_col)
+
     def list_in_string(self, list: list, string: str, lowercase: bool = True):
         """
         Returns True if any entry in the given `list` is in the given `string`.
@@ -357,11 +1757,61 @@ class Sheet:
         """
         if not cell_value:
             raise "Cell Value is None"
-        if "=HYPERLINK(" in cell_value:
-            split = cell_value.split('"')
-            return split[1]
-        else:
+        if type(cell_value) is not str:
+            return False
+        link = parse_hyperlink(cell_value)
+        if link is None:
             return False
+        return self.link_target(link) or False
+
+    def find_link(self, value, hyperlink=None):
+        """
+        Returns the link of a cell with `value` and `hyperlink` as either the
+        target or a (sheet name, coordinate) tuple of the cell holding it.
+        Returns None if the cell isn't a hyperlink.
+        """
+        if hyperlink:
+            return hyperlink.target
+        if type(value) is str and value.startswith("="):
+            return parse_hyperlink(value)
+        return None
+
+    def link_target(self, link):
+        """
+        Returns the target of a `link` from find_link.
+        """
+        if type(link) is not tuple:
+            return link
+        sheet_name, coordinate = link
+        row, col = coordinate_to_tuple(coordinate)
+        if sheet_name is None or sheet_name == self.cur_sheet.title:
+            return self.read_cells([row], col)[0]
+        if sheet_name not in self.wb.sheetnames:
+            return None
+        if self.read_only:
+            return self.wb[sheet_name].cell(row=row, column=col).value
+        cell = self.wb[sheet_name]._cells.get((row, col))
+        return None if cell is None else cell.value
+
+    def resolve_cell(self, row: int, col: int, value, hyperlink=None):
+        """
+        Returns the hyperlink target of the cell at `row` and `col` with
+        `value` and `hyperlink` if it has one, otherwise returns `value`.
+
+        Links are cached by cell until the cell is updated.
+        """
+        link = self.hyperlink_cache.get((row, col))
+        if link is None:
+            if hyperlink:
+                link = hyperlink.target
+            elif type(value) is str and value.startswith("="):
+                link = parse_hyperlink(value)
+            if link is None:
+                return value
+            self.hyperlink_cache[(row, col)] = link
+        if type(link) is tuple:
+            return self.link_target(link)
+        return link
 
     def get_cell(self, row_value: str or int, column_value: str or int):
         """
@@ -371,20 +1821,155 @@ class Sheet:
         the hyperlink target will be returned.
         """
         row_k, col_k = self.get_row_col_index(row_value, column_value)
-        # gets the value
-        if row_k is not None and col_k is not None:
-            cell = self.cur_sheet.cell(row=row_k, column=col_k)
-            if cell.hyperlink:
-                return cell.hyperlink.target
-            if type(cell.value) is str:
-                # TODO add better regex test
-                if "=HYPERLINK" in cell.value:
-                    link = self.extract_hyperlink(cell.value)
-                    if link:
-                        return link
-            return self.cur_sheet.cell(row=row_k, column=col_k).value
-        else:
+        if row_k is None or col_k is None:
             return None
+        if (row_k, col_k) in self.hyperlink_cache:
+            return self.link_target(self.hyperlink_cache[(row_k, col_k)])
+        # gets the value from the streamed rows
+        if self.read_only:
+            if not 0 < row_k <= len(self.rows):
+                return None
+            values = self.rows[row_k - 1]
+            value = values[col_k - 1] if 0 < col_k <= len(values) else None
+            return self.resolve_cell(row_k, col_k, value)
+        # gets the value without adding a cell if it doesn't exist
+        cell = self.cur_sheet._cells.get((row_k, col_k))
+        if cell is None:
+            return None
+        return self.resolve_cell(row_k, col_k, cell.value, cell.hyperlink)
+
+    def read_cells(self, rows: list, col_i: int, hyperlinks: bool = False):
+        """
+        Returns a list of the values in column `col_i` for each of the `rows`.
+
+        Cells are read straight from the worksheet's cells without creating
+        the missing ones like `cur_sheet.cell` does. Hyperlink targets are only
+        looked up if `hyperlinks` is True.
+        """
+        if self.read_only:
+            values = []
+            for row in rows:
+                line = self.rows[row - 1] if 0 < row <= len(self.rows) else ()
+                values.append(line[col_i - 1] if 0 < col_i <= len(line) else None)
+            if hyperlinks:
+                values = [
+                    self.resolve_cell(row, col_i, value)
+                    for row, value in zip(rows, values)
+                ]
+            return values
+        get_cell = self.cur_sheet._cells.get
+        cells = [get_cell((row, col_i)) for row in rows]
+        if hyperlinks:
+            return [
+                (
+                    None
+                    if cell is None
+                    else self.resolve_cell(row, col_i, cell.value, cell.hyperlink)
+                )
+                for row, cell in zip(rows, cells)
+            ]
+        return [None if cell is None else cell.value for cell in cells]
+
+    def get_column(self, column_value: str or int, hyperlinks: bool = False):
+        """
+        Returns a dictionary with the value of `column_value` for every row
+        by its `column_name` value.
+
+        Hyperlink targets are only looked up if `hyperlinks` is True.
+        """
+        col_k = self.get_row_col_index(None, column_value)[1]
+        if col_k is None:
+            raise KeyError(f"{column_value} is not a column in {self.sheet_name}")
+        row_values, rows = zip(*self.row_idx.items()) if self.row_idx else ((), ())
+        return dict(zip(row_values, self.read_cells(rows, col_k, hyperlinks)))
+
+    def get_hyperlinks(self, column_value: str or int):
+        """
+        Returns a dictionary with the hyperlink target of every cell in
+        `column_value` that has one by its `column_name` value.
+        """
+        col_k = self.get_row_col_index(None, column_value)[1]
+        if col_k is None:
+            raise KeyError(f"{column_value} is not a column in {self.sheet_name}")
+        links = {}
+        for row_value, row in self.row_idx.items():
+            link = self.hyperlink_cache.get((row, col_k))
+            if link is None:
+                if self.read_only:
+                    link = self.find_link(self.read_cells([row], col_k)[0])
+                else:
+                    cell = self.cur_sheet._cells.get((row, col_k))
+                    if cell is not None:
+                        link = self.find_link(cell.value, cell.hyperlink)
+                if link is None:
+                    continue
+                self.hyperlink_cache[(row, col_k)] = link
+            links[row_value] = self.link_target(link)
+        return links
+
+    @locked
+    def get_row(self, row_value: str or int, hyperlinks: bool = False):
+        """
+        Returns a dictionary with the value of every column in the row of
+        `row_value` or None if the row doesn't exist.
+
+        Hyperlink targets are only looked up if `hyperlinks` is True.
+        """
+        row_k = self.get_row_col_index(row_value, None)[0]
+        if row_k is None:
+            return None
+        width = max(self.col_idx.values(), default=0)
+        if self.read_only:
+            if not 0 < row_k <= len(self.rows):
+                return None
+            values = self.rows[row_k - 1]
+            if hyperlinks:
+                values = [
+                    self.resolve_cell(row_k, col_i, value)
+                    for col_i, value in enumerate(values, start=1)
+                ]
+        else:
+            rows = self.cur_sheet.iter_rows(
+                min_row=row_k,
+                max_row=row_k,
+                max_col=width,
+                values_only=not hyperlinks,
+            )
+            values = next(rows, ())
+            if hyperlinks:
+                values = [
+                    self.resolve_cell(row_k, col_i, cell.value, cell.hyperlink)
+                    for col_i, cell in enumerate(values, start=1)
+                ]
+        return {
+            column: values[col_i - 1] if col_i <= len(values) else None
+            for column, col_i in self.col_idx.items()
+        }
+
+    def get_cells(
+        self,
+        row_values: list,
+        column_values: list,
+        hyperlinks: bool = False,
+    ):
+        """
+        Returns a dictionary by each of `row_values` with dictionaries of
+        their values by each of `column_values`.
+
+        Cells that don't exist are None like with get_cell and hyperlink
+        targets are only looked up if `hyperlinks` is True.
+        """
+        rows = [self.get_row_col_index(value, None)[0] for value in row_values]
+        cells = {row_value: {} for row_value in row_values}
+        for column_value in column_values:
+            col_k = self.get_row_col_index(None, column_value)[1]
+            if col_k is None:
+                values = [None] * len(rows)
+            else:
+                values = self.read_cells([row or 0 for row in rows], col_k, hyperlinks)
+            for row_value, value in zip(row_values, values):
+                cells[row_value][column_value] = value
+        return cells
 
     def update_index(self, column_key: str):
         """
@@ -393,6 +1978,7 @@ class Sheet:
         # TODO add test for this
         self.row_idx[column_key] = self.cur_sheet._current_row
 
+    @locked
     def update_cell(
         self,
         row_val: str,
@@ -411,29 +1997,89 @@ class Sheet:
 
         Saves after change if `save` is True.
         """
+        self.excel.check_writable("update_cell")
         row_key, col_key = self.get_row_col_index(row_val, col_val)
         if row_key is not None and col_key is not None:
-            cell = self.cur_sheet.cell(row=row_key, column=col_key)
-            cur_val = cell.value
-            # returns False if replace is False and the current value is not none
-            if not replace and cur_val:
-                return False
-            # updates only if cell will actually be changed
-            if new_val == "":
-                new_val = None
-            if cur_val != new_val:
-                # FIXME datetime objects cause issues with this
-                if cell.is_date:
-                    pass
-                self.cur_sheet.cell(row=row_key, column=col_key).value = new_val
+            if self.write_cell(row_key, col_key, new_val, replace):
                 if save:
-                    self.excel.save(use_print=False, backup=False)
+                    self.excel.request_save()
                 else:
                     self.excel.changes_made = True
                 return True
-        else:
+        return False
+
+    @locked
+    def update_cells(self, updates, replace: bool = True, save: bool = False):
+        """
+        Updates many cells at once.
+
+        Returns a dictionary with True for each cell that was updated and
+        False for each cell that was not updated.
+
+        `updates` can be a dictionary with (row_val, col_val) keys and the
+        new values or a pandas DataFrame indexed by row values with columns
+        named after the sheet columns. Empty DataFrame cells are skipped.
+
+        `replace` works the same as in update_cell for every cell.
+
+        Saves once after all changes if `save` is True.
+        """
+        self.excel.check_writable("update_cells")
+        if isinstance(updates, pd.DataFrame):
+            updates = {
+                (row_val, col_val): value
+                for col_val, column in updates.astype(object).items()
+                for row_val, value in column.items()
+                if not pd.isna(value)
+            }
+        results = {}
+        for (row_val, col_val), new_val in updates.items():
+            row_key, col_key = self.get_row_col_index(row_val, col_val)
+            if row_key is None or col_key is None:
+                results[(row_val, col_val)] = False
+            else:
+                changed = self.write_cell(row_key, col_key, new_val, replace)
+                results[(row_val, col_val)] = changed
+        if any(results.values()):
+            if save:
+                self.excel.request_save()
+            else:
+                self.excel.changes_made = True
+        return results
+
+    def write_cell(self, row_key: int, col_key: int, new_val, replace: bool = True):
+        """
+        Sets the cell at `row_key` and `col_key` to `new_val` if it would
+        change it. Used by update_cell and update_cells.
+
+        Returns True if the cell was changed.
+        """
+        cell = self.cur_sheet.cell(row=row_key, column=col_key)
+        cur_val = cell.value
+        # returns False if replace is False and the current value is not none
+        if not replace and cur_val:
             return False
+        # updates only if cell will actually be changed
+        if new_val == "":
+            new_val = None
+        if cur_val == new_val:
+            return False
+        # FIXME datetime objects cause issues with this
+        if cell.is_date:
+            pass
+        cell.value = new_val
+        self.clear_caches()
+        self.hyperlink_cache.pop((row_key, col_key), None)
+        self.dirty_rows.add(row_key)
+        for columns, index in self.indexes.items():
+            if any(self.col_idx[column] == col_key for column in columns):
+                index.discard_row(row_key)
+                key = self.row_secondary_key(index, row_key)
+                if key is not None:
+                    index.add(key, row_key)
+        return True
 
+    @locked
     def add_new_line(
         self,
         cell_dict: dict,
@@ -450,58 +2096,184 @@ class Sheet:
 
         Saves after change if `save` is True.
         """
-        # missing column checker
-        for col in cell_dict.keys():
-            if col not in self.col_idx and col not in self.missing_columns:
+        self.excel.check_writable("add_new_line")
+        self.add_new_lines([cell_dict], save=save)
+        return True
+
+    def get_line_mapping(self, columns: list):
+        """
+        Returns a list of (position in the line, sheet column position) pairs
+        for the `columns` that exist within the sheet.
+
+        Columns that don't exist are logged once per sheet.
+        """
+        mapping = []
+        for i, col in enumerate(columns):
+            if col in self.col_idx:
+                mapping.append((i, self.col_idx[col] - 1))
+            elif col not in self.missing_columns:
                 self.missing_columns.append(col)
-                msg = f"add_new_line: Missing {col} in {self.sheet_name} sheet"
+                msg = f"add_new_lines: Missing {col} in {self.sheet_name} sheet"
                 self.excel.log(msg, "warning")
-        column_key = None
-        append_list = []
-        for col in self.col_idx:
-            if col in cell_dict.keys():
-                cell_value = cell_dict[col]
-                # gets key for updating the index
-                if self.column_name == col:
-                    column_key = cell_value
-            if col in cell_dict:
-                append_list.append(cell_dict[col])
-            else:
-                append_list.append("")
-        if not column_key:
-            raise "column_name value was not given."
-        self.cur_sheet.append(append_list)
-        self.update_index(column_key)
+        return mapping
+
+    @locked
+    def add_new_lines(self, lines, save: bool = False):
+        """
+        Adds all `lines` onto new lines within the excel sheet and returns
+        how many lines were added. The column_name must be given a value
+        in every line.
+
+        `lines` can be an iterable of dictionaries like the one used by
+        add_new_line, tuples with values in the order of the sheet columns
+        or a pandas DataFrame with columns named after the sheet columns.
+
+        Raises a ValueError without adding any lines if a line has no
+        column_name value.
+
+        Saves after the changes if `save` is True.
+        """
+        self.excel.check_writable("add_new_lines")
+        width = max(self.col_idx.values(), default=0)
+        key_i = self.col_idx[self.column_name] - 1
+        # columns without values are left blank like in add_new_line
+        blank_line = [None] * width
+        for col_i in self.col_idx.values():
+            blank_line[col_i - 1] = ""
+        # each line is turned into (mapping, values)
+        if isinstance(lines, pd.DataFrame):
+            lines = lines.astype(object).where(lines.notna(), "")
+            mapping = self.get_line_mapping(list(lines.columns))
+            lines = ((mapping, v) for v in lines.itertuples(index=False, name=None))
+        else:
+            mappings = {}
+            positions = [col_i - 1 for col_i in sorted(self.col_idx.values())]
+            tuple_mapping = list(enumerate(positions))
+
+            def with_mapping(line):
+                if not isinstance(line, dict):
+                    return tuple_mapping, line
+                columns = tuple(line)
+                if columns not in mappings:
+                    mappings[columns] = self.get_line_mapping(columns)
+                return mappings[columns], tuple(line.values())
+
+            lines = map(with_mapping, lines)
+        # every line is checked before any are added
+        keys, append_lists = [], []
+        for mapping, values in lines:
+            append_list = blank_line.copy()
+            for value_i, col_i in mapping:
+                if value_i < len(values):
+                    append_list[col_i] = values[value_i]
+            column_key = append_list[key_i]
+            if column_key is None or column_key == "":
+                raise ValueError("column_name value was not given.")
+            append_lists.append(append_list)
+            keys.append(column_key)
+        for append_list in append_lists:
+            self.cur_sheet.append(append_list)
+        # indexes all of the new rows at once
+        first_row = self.cur_sheet._current_row - len(keys) + 1
+        for row, column_key in enumerate(keys, start=first_row):
+            self.row_idx[column_key] = row
+        for index in self.indexes.values():
+            for row in range(first_row, first_row + len(keys)):
+                key = self.row_secondary_key(index, row)
+                if key is not None:
+                    index.add(key, row)
+        self.clear_caches()
+        self.dirty_rows.update(range(first_row, first_row + len(keys)))
+        if not keys:
+            return 0
         if save:
-            self.excel.save(use_print=False, backup=False)
+            self.excel.request_save()
         else:
             self.excel.changes_made = True
-        return True
+        return len(keys)
 
+    @locked
     def delete_row(self, col_val: str, save: bool = False):
         """
         Deletes row by `column_value`.
 
         `save` allows you to force a save after deleting a row.
         """
+        self.excel.check_writable("delete_row")
         if col_val not in self.row_idx:
             return None
-        row = self.row_idx[col_val]
+        row = self.row_idx.pop(col_val)  # removes index of row from row_idx
         self.cur_sheet.delete_rows(row)
-        self.row_idx.pop(col_val)  # removes index of row from row_idx
+        self.row_idx.remove_rows([row])  # shifts the rows below up
+        self.hyperlink_cache.clear()
+        for index in self.indexes.values():
+            index.remove_rows([row])
+        self.clear_caches()
+        self.remove_dirty_rows([row])
         self.excel.changes_made = True
         if save:
-            self.excel.save(use_print=False, backup=False)
+            self.excel.request_save()
         return True
 
+    @locked
+    def delete_rows(self, col_vals: list, save: bool = False):
+        """
+        Deletes every row by the `col_vals` that exist and returns how many
+        rows were deleted.
+
+        Neighbouring rows are deleted together as a single range, starting
+        from the bottom so rows that are still to be deleted do not move.
+
+        `save` allows you to force a save after deleting the rows.
+        """
+        self.excel.check_writable("delete_rows")
+        rows = {self.row_idx.pop(val) for val in set(col_vals) if val in self.row_idx}
+        rows = sorted(rows)
+        if not rows:
+            return 0
+        # groups neighbouring rows into [start, amount] ranges
+        ranges = []
+        for row in rows:
+            if ranges and sum(ranges[-1]) == row:
+                ranges[-1][1] += 1
+            else:
+                ranges.append([row, 1])
+        for start, amount in reversed(ranges):
+            self.cur_sheet.delete_rows(start, amount)
+        self.row_idx.remove_rows(rows)  # shifts the rows below up
+        self.hyperlink_cache.clear()
+        for index in self.indexes.values():
+            index.remove_rows(rows)
+        self.clear_caches()
+        self.remove_dirty_rows(rows)
+        self.excel.changes_made = True
+        if save:
+            self.excel.request_save()
+        return len(rows)
+
+    @locked
     def delete_column(self, column_name: str):
         """
         Deletes column by `column_name`.
         """
+        self.excel.check_writable("delete_column")
         if column_name not in self.col_idx:
             return None
-        column = self.col_idx[column_name]
+        column = self.col_idx.pop(column_name)
         self.cur_sheet.delete_cols(column)
+        # shifts the columns to the right over
+        for name, col_i in self.col_idx.items():
+            if col_i > column:
+                self.col_idx[name] = col_i - 1
+        self.column_formats = None
+        self.hyperlink_cache.clear()
+        self.indexes = {
+            columns: index
+            for columns, index in self.indexes.items()
+            if column_name not in columns
+        }
+        self.clear_caches()
+        self.dirty_columns.discard(column_name)
         self.excel.changes_made = True
         return True
 
@@ -545,143 +2317,205 @@ class Sheet:
         else:
             cell.style = "General"
 
+    @property
+    def format_rules(self):
+        """
+        The compiled FormatRules for the current options.
+        """
+        return compile_format_rules(freeze(self.options))
+
     def format_picker(self, column: str):
         """
         Determines what formatting to apply to a column.
         """
-        option_keys = self.options.keys()
-        actions = []
-        # border
-        actions.append("default_border")
-        # alignment
-        alignment = None
-        if "default_align" in option_keys:
-            alignment = self.options["default_align"]
-        if "left_align" in option_keys:
-            if column in self.options["left_align"]:
-                alignment = "left_align"
-            else:
-                alignment = "center_align"
-        if "right_align" in option_keys:
-            if column in self.options["right_align"]:
-                alignment = "right_align"
-            else:
-                alignment = "center_align"
-        if alignment:
-            actions.append(alignment)
-        # fill
-        if "black_fill" in option_keys:
-            if self.list_in_string(self.options["black_fill"], column):
-                actions.append("black_fill")
-        elif "light_grey_fill" in option_keys:
-            if self.list_in_string(self.options["light_grey_fill"], column):
-                actions.append("light_grey_fill")
-        # percent
-        if "percent" in option_keys:
-            if self.list_in_string(self.options["percent"], column):
-                actions.append("percent")
-                return actions
-        # currency
-        if "currency" in option_keys:
-            if self.list_in_string(self.options["currency"], column):
-                actions.append("currency")
-                return actions
-        if "integer" in option_keys:
-            if column in self.options["integer"]:
-                actions.append("integer")
-                return actions
-        # decimal
-        # TODO allow variable decimal place
-        if "decimal" in option_keys:
-            if column in self.options["decimal"]:
-                actions.append("decimal")
-                return actions
-        # countdown
-        if "count_days" in option_keys:
-            if column in self.options["count_days"]:
-                actions.append("count_days")
-                return actions
-        # dates
-        if "date" in option_keys:
-            if self.list_in_string(self.options["date"], column):
-                actions.append("date")
-                return actions
-        return actions
+        return list(self.format_rules.pick(column))
 
     def get_column_formats(self):
         """
         Gets the formats to use for each column.
         """
+        format_rules = self.format_rules
         format_actions = {}
         for column in self.col_idx.keys():
-            actions = self.format_picker(column)
             if column not in format_actions.keys():
-                format_actions[column] = actions
+                format_actions[column] = list(format_rules.pick(column))
         return format_actions
 
-    def format_header(self):
+    def get_header_font(self):
         """
-        Formats the top header of the sheet.
+        Gets the header Font from the "header" options if they were given.
         """
+        if "header" not in self.options:
+            return None
         header_options = self.options["header"]
-        font_size = header_options["font_size"]
-        bold_font = header_options["bold"]
-        for column in self.col_idx.keys():
-            col_i = self.col_idx[column]
-            cell = self.cur_sheet.cell(row=1, column=col_i)
-            cell.font = Font(
-                name="Calibri",
-                size=font_size,
-                bold=bold_font,
-                # color="FF000000",
-            )
+        return Font(
+            name="Calibri",
+            size=header_options["font_size"],
+            bold=header_options["bold"],
+            # color="FF000000",
+        )
 
+    @locked
+    def format_header(self):
+        """
+        Formats the top header of the sheet.
+        """
+        self.excel.check_writable("format_header")
+        font = self.get_header_font()
+        if not font:
+            return
+        for col_i in self.col_idx.values():
+            self.cur_sheet.cell(row=1, column=col_i).font = font
+
+    @locked
     def format_cell(self, column: str, row_i: int, col_i: int):
         """
         Formats a cell based on the `column` name using `row_i` and `col_i`.
         """
-        # TODO add test for this
+        self.excel.check_writable("format_cell")
         cell = self.cur_sheet.cell(row=row_i, column=col_i)
+        self.apply_style(cell, self.get_column_styles()[column])
+        # makes sure changes will be saved next time the file is saved.
+        self.excel.changes_made = True
+
+    def get_column_styles(self):
+        """
+        Gets the StyleBundle to use for each column.
+        """
         # gets format_actions if it has not be set yet
         if not self.column_formats:
             self.column_formats = self.get_column_formats()
-        formatting = self.column_formats[column]
-        # percent
-        if "percent" in formatting:
-            self.set_style(cell, format="percent")
-        # currency
-        elif "currency" in formatting:
-            self.set_style(cell, format="currency")
-        # integer
-        elif "integer" in formatting:
-            cell.number_format = "0"
-        # decimal
-        elif "decimal" in formatting:
-            # TODO add decimal increase/decrease
-            cell.number_format = "#,#0.0"
-        # countdown
-        elif "count_days" in formatting:
-            cell.number_format = '# "Days"'
-        # dates
-        elif cell.is_date:
-            cell.number_format = "mm-dd-yy"
-        # border
-        if "default_border" in formatting:
-            self.set_border(cell)
-        # alignment
-        if "left_align" in formatting:
-            cell.alignment = Alignment(horizontal="left")
-        elif "center_align" in formatting:
-            cell.alignment = Alignment(horizontal="center")
-        elif "right_align" in formatting:
-            cell.alignment = Alignment(horizontal="right")
-        # fill
-        if "black_fill" in formatting:
-            self.set_fill(cell, color="fffff")
-        elif "light_grey_fill" in formatting:
-            self.set_fill(cell, color="F2F2F2")
-        # makes sure changes will be saved next time the file is saved.
-        self.changes_made = True
+            self.column_styles = None
+        if not self.column_styles:
+            self.column_styles = {
+                column: compile_style(tuple(actions))
+                for column, actions in self.column_formats.items()
+            }
+        return self.column_styles
+
+    def apply_style(self, cell: object, bundle: StyleBundle):
+        """
+        Applies the styles in `bundle` to `cell`.
+        """
+        self.apply_style_to_cells([cell], bundle)
+
+    def apply_style_to_cells(self, cells: list, bundle: StyleBundle):
+        """
+        Applies the styles in `bundle` to all `cells`.
+
+        The resulting cell style is remembered for each starting style so
+        matching cells only need it copied over.
+
+        With `named_styles` only cells with styles of their own that the
+        named style would replace are styled here, the rest get the named
+        style.
+        """
+        if self.named_styles:
+            cells = self.apply_named_style_to_cells(cells, bundle)
+        # bundles hash slowly so they are looked up by id, keeping a
+        # reference to the bundle so its id can't be reused
+        if id(bundle) not in self.style_cache:
+            self.style_cache[id(bundle)] = (bundle, {})
+        styles = self.style_cache[id(bundle)][1]
+        check_date = bundle.date_format is not None
+        for cell in cells:
+            is_date = check_date and cell.is_date
+            key = (tuple(cell._style or ()), is_date)
+            style = styles.get(key)
+            if style is not None:
+                cell._style = copy(style)
+                continue
+            if bundle.style:
+                cell.style = bundle.style
+            elif bundle.number_format:
+                cell.number_format = bundle.number_format
+            elif is_date:
+                cell.number_format = bundle.date_format
+            if bundle.border:
+                cell.border = bundle.border
+            if bundle.alignment:
+                cell.alignment = bundle.alignment
+            if bundle.fill:
+                cell.fill = bundle.fill
+            styles[key] = copy(cell._style)
+
+    def get_named_style(self, bundle: StyleBundle, is_date: bool = False):
+        """
+        Gets the name of the named style matching `bundle` and registers it
+        with the workbook if it does not exist yet.
+
+        `is_date` gets the version for cells containing dates.
+        """
+        name = f"easierexcel {bundle.name}"
+        if is_date:
+            name += " date"
+        if name in self.wb.named_styles:
+            return name
+        style = NamedStyle(name=name)
+        if bundle.style:
+            builtin = builtin_styles[bundle.style]
+            style.font = builtin.font
+            style.number_format = builtin.number_format
+        elif bundle.number_format:
+            style.number_format = bundle.number_format
+        elif is_date:
+            style.number_format = bundle.date_format
+        if bundle.border:
+            style.border = bundle.border
+        if bundle.alignment:
+            style.alignment = bundle.alignment
+        if bundle.fill:
+            style.fill = bundle.fill
+        self.wb.add_named_style(style)
+        return name
+
+    def apply_named_style_to_cells(self, cells: list, bundle: StyleBundle):
+        """
+        Applies the named style matching `bundle` to all `cells` that would
+        not lose any of their own styles to it.
+
+        A named style replaces the whole cell style, so cells with a font,
+        number format or other style that `bundle` does not set are
+        returned instead to be styled one at a time.
+        """
+        check_date = bundle.date_format is not None
+        styles = {}
+        styled = []
+        for cell in cells:
+            is_date = check_date and cell.is_date
+            if is_date not in styles:
+                name = self.get_named_style(bundle, is_date)
+                style = self.wb._named_styles[name].as_tuple()
+                styles[is_date] = (style, self.kept_style_fields(bundle, is_date))
+            style, fields = styles[is_date]
+            current = cell._style
+            if current and any(
+                getattr(current, field) not in (0, getattr(style, field))
+                for field in fields
+            ):
+                styled.append(cell)
+            else:
+                cell._style = copy(style)
+        return styled
+
+    @staticmethod
+    def kept_style_fields(bundle: StyleBundle, is_date: bool = False):
+        """
+        Gets the cell style fields that `bundle` leaves alone and so must
+        not be replaced by its named style.
+        """
+        fields = ["protectionId", "quotePrefix", "pivotButton"]
+        if not bundle.style:
+            fields.append("fontId")
+            if not bundle.number_format and not is_date:
+                fields.append("numFmtId")
+        if not bundle.border:
+            fields.append("borderId")
+        if not bundle.alignment:
+            fields.append("alignmentId")
+        if not bundle.fill:
+            fields.append("fillId")
+        return fields
 
     def format_row(self, row_identifier: str):
         """
@@ -695,18 +2529,202 @@ class Sheet:
             col_i = self.col_idx[column]
             self.format_cell(column, row_i, col_i)
 
-    def format_all_cells(self):
+    def plan_formatting(self):
         """
-        Auto formats all cells.
-        TODO check for a way to make it use openpyxl more
+        Gets a list of (column index, StyleBundle) pairs that format_all_cells
+        applies.
+        """
+        column_styles = self.get_column_styles()
+        return [(col_i, column_styles[col]) for col, col_i in self.col_idx.items()]
+
+    @locked
+    def format_all_cells(self, incremental: bool = False):
+        """
+        Auto formats all cells including the header.
+
+        Formatting is planned for each column first and then applied to the
+        whole column at once.
+
+        If `incremental` is True only the rows and columns changed since the
+        last format or save are formatted, unless the options were changed.
         """
-        # TODO add test for this
         # return early if options is not valid
         if not self.options:
             return False
-        self.format_header()
-        for column in self.col_idx.keys():
-            # runs through all cells in a column and runs the actions
-            col_i = self.col_idx[column]
-            for row_i in self.row_idx.values():
-                self.format_cell(column, row_i, col_i)
+        self.excel.check_writable("format_all_cells")
+        if incremental and self.options == self.formatted_options:
+            return self.format_dirty_cells()
+        if self.options != self.formatted_options:
+            self.formatted_options = deepcopy(self.options)
+            self.column_formats = None
+        header_font = self.get_header_font()
+        # only rows with a column_name value are formatted
+        rows = sorted(self.row_idx.values())
+        for col_i, style in self.plan_formatting():
+            if header_font:
+                self.cur_sheet.cell(row=1, column=col_i).font = header_font
+            cells = [self.cur_sheet.cell(row=row, column=col_i) for row in rows]
+            self.apply_style_to_cells(cells, style)
+            # new cells in the column get the same style within Excel
+            if self.named_styles:
+                letter = get_column_letter(col_i)
+                dimension = self.cur_sheet.column_dimensions[letter]
+                name = self.get_named_style(style)
+                dimension._style = copy(self.wb._named_styles[name].as_tuple())
+        self.clear_dirty()
+        self.excel.changes_made = True
+
+    @locked
+    def format_dirty_cells(self):
+        """
+        Formats only the rows and columns changed since the last format or
+        save.
+        """
+        self.excel.check_writable("format_dirty_cells")
+        column_styles = self.get_column_styles()
+        all_rows = sorted(self.row_idx.values())
+        indexed_rows = set(all_rows)
+        rows = [row for row in sorted(self.dirty_rows) if row in indexed_rows]
+        for column, col_i in self.col_idx.items():
+            col_rows = all_rows if column in self.dirty_columns else rows
+            cells = [self.cur_sheet.cell(row=row, column=col_i) for row in col_rows]
+            self.apply_style_to_cells(cells, column_styles[column])
+        if rows or self.dirty_columns:
+            self.excel.changes_made = True
+        self.clear_dirty()
+
+
+class SheetMap(Mapping):
+    """
+    Sheets by sheet name created by Excel.sheets.
+
+    Sheets that were not created yet are created when first accessed.
+    """
+
+    def __init__(self, excel_object, column_names, sheet_names, sheet_kwargs):
+        self.excel = excel_object
+        self.column_names = column_names
+        self.sheet_names = list(sheet_names)
+        self.sheet_kwargs = sheet_kwargs
+        self.built = {}
+        self.lock = threading.Lock()
+
+    def build(self, sheet_name: str):
+        """
+        Creates the Sheet for `sheet_name` unless it already exists.
+        """
+        with self.lock:
+            if sheet_name in self.built:
+                return self.built[sheet_name]
+        sheet = Sheet(
+            self.excel,
+            self.column_names[sheet_name],
+            sheet_name=sheet_name,
+            **self.sheet_kwargs,
+        )
+        with self.lock:
+            return self.built.setdefault(sheet_name, sheet)
+
+    def build_all(self):
+        """
+        Creates every Sheet not created yet.
+        """
+        names = [name for name in self.sheet_names if name not in self.built]
+        with self.excel.batch_index_cache():
+            for name in names:
+                self.build(name)
+
+    def is_built(self, sheet_name: str):
+        return sheet_name in self.built
+
+    def __getitem__(self, sheet_name):
+        if sheet_name not in self.sheet_names:
+            raise KeyError(sheet_name)
+        return self.build(sheet_name)
+
+    def __iter__(self):
+        return iter(self.sheet_names)
+
+    def __len__(self):
+        return len(self.sheet_names)
+
+    def __repr__(self):
+        return f"SheetMap({self.sheet_names})"
+
+
+WorkbookResult = namedtuple("WorkbookResult", ["filename", "result", "error"])
+
+
+def run_workbook_job(
+    filename, job, column_name, sheet_name, save, backup, excel_kwargs
+):
+    """
+    Opens `filename`, runs `job` on its Sheet and saves any changes.
+
+    Runs inside the worker processes of `process_workbooks`.
+    """
+    try:
+        excel_kwargs.setdefault("use_logging", False)
+        with Excel(filename, **excel_kwargs) as excel_obj:
+            sheet = Sheet(excel_obj, column_name, sheet_name=sheet_name)
+            result = job(sheet)
+            if save and excel_obj.changes_made:
+                excel_obj.save(use_print=False, backup=backup)
+        return WorkbookResult(filename, result, None)
+    except Exception as error:
+        return WorkbookResult(filename, None, error)
+
+
+def process_workbooks(
+    filenames,
+    job,
+    column_name: str,
+    sheet_name: str = None,
+    save: bool = True,
+    backup: bool = True,
+    max_workers: int = None,
+    **excel_kwargs,
+):
+    """
+    Runs `job` on a Sheet of every workbook in `filenames` using a process
+    pool and returns a list of WorkbookResult(filename, result, error) in the
+    same order as `filenames`.
+
+    `job` is called with the Sheet and must be a module level function so it
+    can be sent to the worker processes. Changes are saved afterwards if
+    `save` is True, with a backup first if `backup` is True.
+
+    A workbook that fails has its exception as the error instead of stopping
+    the others.
+
+    `max_workers` defaults to the number of cores and `excel_kwargs` are
+    passed to each Excel object.
+    """
+    filenames = list(filenames)
+    if not filenames:
+        return []
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(filenames))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                run_workbook_job,
+                filename,
+                job,
+                column_name,
+                sheet_name,
+                save,
+                backup,
+                dict(excel_kwargs),
+            )
+            for filename in filenames
+        ]
+        results = []
+        for filename, future in zip(filenames, futures):
+            try:
+                results.append(future.result())
+            except Exception as error:
+                # the worker process died or the job couldn't be pickled
+                results.append(WorkbookResult(filename, None, error))
+    return results
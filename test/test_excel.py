@@ -1,7 +1,10 @@
-import unittest
+import unittest, tempfile, shutil, os, time, logging, openpyxl, threading
+import datetime, json
+from unittest import mock
 
 # classes
-from easierexcel import Excel, Sheet
+from easierexcel import Excel, Sheet, process_workbooks
+from easierexcel import encode_index_key, decode_index_key
 
 
 class TestSave(unittest.TestCase):
@@ -21,6 +24,407 @@ class TestSave(unittest.TestCase):
         self.assertEqual(sheet3.get_cell("Brian", "Birth Month"), "June")
 
 
+class TestAtomicSave(unittest.TestCase):
+    def test_atomic_save(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\excel_test.xlsx", path)
+            original_size = os.path.getsize(path)
+            excel_obj = Excel(filename=path, atomic_save=True)
+            sheet1 = Sheet(excel_obj, "Name")
+            sheet1.update_cell("Brian", "Birth Month", "May")
+            self.assertTrue(excel_obj.save(use_print=False))
+            self.assertFalse(excel_obj.changes_made)
+            # the old file became the backup
+            self.assertEqual(os.path.getsize(f"{path}.bak"), original_size)
+            self.assertEqual(
+                sorted(os.listdir(tmp)), ["excel_test.xlsx", "excel_test.xlsx.bak"]
+            )
+            sheet1.update_cell("Brian", "Age", 50)
+            excel_obj.save(use_print=False)
+            self.assertEqual(os.path.getsize(f"{path}.bak"), original_size)
+            sheet1 = Sheet(Excel(filename=path), "Name")
+            self.assertEqual(sheet1.get_cell("Brian", "Birth Month"), "May")
+            self.assertEqual(sheet1.get_cell("Brian", "Age"), 50)
+
+    def test_atomic_save_keeps_mode(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\\excel_test.xlsx", path)
+            os.chmod(path, 0o644)
+            excel_obj = Excel(filename=path, atomic_save=True)
+            excel_obj.save(use_print=False, force_save=True)
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o644)
+            self.assertTrue(os.path.exists(f"{path}.bak"))
+
+    def test_atomic_save_failure(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\excel_test.xlsx", path)
+            excel_obj = Excel(filename=path, atomic_save=True)
+
+            def failed_save(file):
+                file.write(b"partial")
+                raise OSError("disk full")
+
+            excel_obj.wb.save = failed_save
+            with self.assertRaises(OSError):
+                excel_obj.save(use_print=False, force_save=True)
+            # the excel file and folder are untouched
+            self.assertEqual(os.listdir(tmp), ["excel_test.xlsx"])
+            self.assertEqual(
+                Sheet(Excel(filename=path), "Name").get_cell("Rob", "Age"), 36
+            )
+
+
+class TestSaveAsync(unittest.TestCase):
+    def test_save_async(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\excel_test.xlsx", path)
+            excel_obj = Excel(filename=path)
+            sheet1 = Sheet(excel_obj, "Name")
+            sheet1.update_cell("Brian", "Birth Month", "May")
+            self.assertTrue(excel_obj.save_async().result(timeout=30))
+            self.assertFalse(excel_obj.changes_made)
+            self.assertTrue(os.path.exists(f"{path}.bak"))
+            sheet1 = Sheet(Excel(filename=path), "Name")
+            self.assertEqual(sheet1.get_cell("Brian", "Birth Month"), "May")
+
+    def test_reads_during_save_async(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\\excel_test.xlsx", path)
+            excel_obj = Excel(filename=path)
+            sheet1 = Sheet(excel_obj, "Name")
+            sheet1.update_cell("Brian", "Age", 50)
+            saving = threading.Event()
+            save = excel_obj.wb.save
+
+            def slow_save(file):
+                saving.set()
+                time.sleep(0.1)
+                save(file)
+
+            excel_obj.wb.save = slow_save
+            future = excel_obj.save_async(backup=False)
+            saving.wait(timeout=30)
+            for row in range(2, 50):
+                sheet1.get_cell(row, 30)
+            self.assertEqual(sheet1.get_row("Brian")["Age"], 50)
+            self.assertEqual(len(sheet1.create_dataframe()), 6)
+            self.assertTrue(future.result(timeout=30))
+            # missing cells are read without being added
+            self.assertNotIn((2, 30), sheet1.cur_sheet._cells)
+
+    def test_save_async_coalesces(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\excel_test.xlsx", path)
+            excel_obj = Excel(filename=path)
+            sheet1 = Sheet(excel_obj, "Name")
+            saves = []
+            save = excel_obj.wb.save
+            excel_obj.wb.save = lambda file: saves.append(save(file))
+            # holding the lock keeps the first save running
+            with excel_obj.lock:
+                first = excel_obj.save_async(backup=False)
+                while not first.running():
+                    time.sleep(0.01)
+                second = excel_obj.save_async(backup=False)
+                sheet1.update_cell("Brian", "Age", 50)
+                third = excel_obj.save_async(backup=False)
+            self.assertIsNot(first, second)
+            self.assertIs(second, third)
+            self.assertTrue(third.result(timeout=30))
+            self.assertTrue(first.result(timeout=30))
+            self.assertEqual(len(saves), 2)
+            sheet1 = Sheet(Excel(filename=path), "Name")
+            self.assertEqual(sheet1.get_cell("Brian", "Age"), 50)
+
+    def test_save_async_retries(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\excel_test.xlsx", path)
+            excel_obj = Excel(filename=path)
+            attempts = []
+
+            def locked_save(file):
+                attempts.append(file)
+                raise PermissionError("File is open")
+
+            excel_obj.wb.save = locked_save
+            future = excel_obj.save_async(backup=False, retries=2, backoff=0.01)
+            with self.assertRaises(PermissionError):
+                future.result(timeout=30)
+            self.assertEqual(len(attempts), 3)
+
+
+class TestAutoSave(unittest.TestCase):
+    def test_save_every(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\excel_test.xlsx", path)
+            with Excel(filename=path, save_every=3, save_on_exit=True) as excel_obj:
+                saves = []
+                write_file = excel_obj.write_file
+                excel_obj.write_file = lambda backup: saves.append(write_file(backup))
+                sheet1 = Sheet(excel_obj, "Name")
+                for age in range(40, 47):
+                    sheet1.update_cell("Brian", "Age", age, save=True)
+                self.assertEqual(len(saves), 2)
+                self.assertEqual(excel_obj.requested_saves, 1)
+            # the last change is saved when the with block ends
+            self.assertEqual(len(saves), 3)
+            sheet1 = Sheet(Excel(filename=path), "Name")
+            self.assertEqual(sheet1.get_cell("Brian", "Age"), 46)
+
+    def test_save_interval(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\excel_test.xlsx", path)
+            excel_obj = Excel(filename=path, save_interval=60)
+            sheet1 = Sheet(excel_obj, "Name")
+            sheet1.update_cell("Brian", "Age", 40, save=True)
+            self.assertTrue(excel_obj.changes_made)
+            excel_obj.last_save -= 60
+            sheet1.add_new_line({"Name": "Donna"}, save=True)
+            self.assertFalse(excel_obj.changes_made)
+
+    def test_save_on_exit(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\excel_test.xlsx", path)
+            with Excel(filename=path, save_on_exit=True) as excel_obj:
+                sheet1 = Sheet(excel_obj, "Name")
+                sheet1.delete_row("Brian", save=True)
+                self.assertTrue(excel_obj.changes_made)
+            self.assertFalse(excel_obj.changes_made)
+            sheet1 = Sheet(Excel(filename=path), "Name")
+            self.assertNotIn("Brian", sheet1.row_idx)
+
+    def test_no_save_on_exit(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\\excel_test.xlsx", path)
+            with self.assertLogs("easierexcel", "WARNING") as logs:
+                with Excel(filename=path, save_every=100) as excel_obj:
+                    sheet1 = Sheet(excel_obj, "Name")
+                    sheet1.delete_row("Brian", save=True)
+                    sheet1.delete_row("Rob", save=True)
+            self.assertIn("Closed without saving 2 save requests", logs.output[0])
+            self.assertTrue(excel_obj.changes_made)
+            sheet1 = Sheet(Excel(filename=path), "Name")
+            self.assertIn("Brian", sheet1.row_idx)
+
+
+class TestClose(unittest.TestCase):
+    def test_shared_log_handler(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = os.path.join(tmp, "excel.log")
+            logger = logging.getLogger("easierexcel")
+
+            def handlers():
+                return [
+                    h
+                    for h in logger.handlers
+                    if getattr(h, "baseFilename", None) == os.path.abspath(log_file)
+                ]
+
+            excel_objs = []
+            for _ in range(5):
+                excel_objs.append(Excel("test\excel_test.xlsx", log_file=log_file))
+            self.assertEqual(len(handlers()), 1)
+            for excel_obj in excel_objs[:-1]:
+                excel_obj.close()
+            self.assertEqual(len(handlers()), 1)
+            with excel_objs[-1]:
+                pass
+            self.assertEqual(handlers(), [])
+            # closing twice does nothing
+            excel_objs[-1].close()
+
+    def test_close_flushes_saves(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\excel_test.xlsx", path)
+            with Excel(filename=path, save_every=10, save_on_exit=True) as excel_obj:
+                sheet1 = Sheet(excel_obj, "Name")
+                sheet1.update_cell("Brian", "Age", 40, save=True)
+                future = excel_obj.save_async()
+            self.assertTrue(future.done())
+            self.assertTrue(excel_obj.closed)
+            sheet1 = Sheet(Excel(filename=path), "Name")
+            self.assertEqual(sheet1.get_cell("Brian", "Age"), 40)
+
+    def test_no_save_after_error(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\\excel_test.xlsx", path)
+            with self.assertRaises(RuntimeError):
+                with Excel(
+                    filename=path, save_every=10, save_on_exit=True
+                ) as excel_obj:
+                    sheet1 = Sheet(excel_obj, "Name")
+                    sheet1.update_cell("Brian", "Age", 999, save=True)
+                    raise RuntimeError("job failed")
+            self.assertTrue(excel_obj.closed)
+            sheet1 = Sheet(Excel(filename=path), "Name")
+            self.assertEqual(sheet1.get_cell("Brian", "Age"), 33)
+
+
+def set_brian_age(sheet):
+    sheet.update_cell("Brian", "Age", 40)
+    return sheet.get_cell("Brian", "Birth Year")
+
+
+def fail_after_update(sheet):
+    sheet.update_cell("Brian", "Age", 999, save=True)
+    raise RuntimeError("job failed")
+
+
+class TestProcessWorkbooks(unittest.TestCase):
+    def test_process_workbooks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for i in range(3):
+                path = os.path.join(tmp, f"excel_test_{i}.xlsx")
+                shutil.copy("test\\excel_test.xlsx", path)
+                paths.append(path)
+            missing = os.path.join(tmp, "missing.xlsx")
+            results = process_workbooks(
+                paths + [missing], set_brian_age, "Name", max_workers=2
+            )
+            self.assertEqual([r.filename for r in results], paths + [missing])
+            for result in results[:-1]:
+                self.assertEqual(result.result, 1989)
+                self.assertIsNone(result.error)
+                sheet1 = Sheet(Excel(filename=result.filename), "Name")
+                self.assertEqual(sheet1.get_cell("Brian", "Age"), 40)
+            self.assertIsNotNone(results[-1].error)
+
+    def test_failed_job_not_saved(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\\excel_test.xlsx", path)
+            results = process_workbooks(
+                [path], fail_after_update, "Name", save_every=10, save_on_exit=True
+            )
+            self.assertIsInstance(results[0].error, RuntimeError)
+            sheet1 = Sheet(Excel(filename=path), "Name")
+            self.assertEqual(sheet1.get_cell("Brian", "Age"), 33)
+
+
+class TestIndexCache(unittest.TestCase):
+    def test_index_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\\excel_test.xlsx", path)
+            excel_obj = Excel(filename=path, index_cache=True)
+            sheet1 = Sheet(excel_obj, "Name")
+            self.assertTrue(os.path.exists(f"{path}.idx"))
+            # unchanged files load the indexes without reading the cells
+            with mock.patch.object(Sheet, "get_row_index", side_effect=AssertionError):
+                excel_obj = Excel(filename=path, index_cache=True)
+                sheet1 = Sheet(excel_obj, "Name")
+            self.assertEqual(sheet1.row_idx["Brian"], 4)
+            self.assertEqual(sheet1.col_idx["Age"], 4)
+            # saves rewrite the cache
+            sheet1.add_new_line({"Name": "Tony", "Age": 40})
+            sheet1.delete_row("Michael")
+            excel_obj.save(use_print=False, backup=False)
+            with mock.patch.object(Sheet, "get_row_index", side_effect=AssertionError):
+                sheet1 = Sheet(Excel(filename=path, index_cache=True), "Name")
+            self.assertEqual(sheet1.row_idx["Tony"], 7)
+            self.assertNotIn("Michael", sheet1.row_idx)
+            self.assertEqual(sheet1.get_cell("Tony", "Age"), 40)
+
+    def test_renamed_key(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\\excel_test.xlsx", path)
+            excel_obj = Excel(filename=path, index_cache=True)
+            sheet1 = Sheet(excel_obj, "Name")
+            sheet1.update_cell("Brian", "Name", "Bruce")
+            sheet1.update_cell("Rob", "Name", "John")
+            excel_obj.save(use_print=False, backup=False)
+            # the cache matches the saved cells, not the old indexes
+            sheet1 = Sheet(Excel(filename=path, index_cache=True), "Name")
+            self.assertNotIn("Brian", sheet1.row_idx)
+            self.assertEqual(sheet1.get_cell("Bruce", "Age"), 33)
+            self.assertEqual(sheet1.row_idx["John"], 7)
+            self.assertEqual(
+                sheet1.row_idx, Sheet(Excel(filename=path), "Name").row_idx
+            )
+
+    def test_cache_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\\excel_test.xlsx", path)
+            excel_obj = Excel(filename=path, index_cache=True)
+            with mock.patch.object(
+                excel_obj, "write_index_cache", wraps=excel_obj.write_index_cache
+            ) as write_index_cache:
+                excel_obj.sheets("Name")
+            # one write for every sheet
+            self.assertEqual(write_index_cache.call_count, 1)
+            with open(f"{path}.idx", encoding="utf-8") as file:
+                cache = json.load(file)
+            self.assertEqual(len(cache["indexes"]), 3)
+            sheet1 = Sheet(Excel(filename=path, index_cache=True), "Name", "Sheet 1")
+            self.assertEqual(sheet1.col_idx["Birth Year"], 3)
+
+    def test_invalid_cache_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\\excel_test.xlsx", path)
+            # pickled or malformed files are never loaded as indexes
+            for data in [b"\x80\x04\x95cos\nsystem\n.", b'{"version": 1}']:
+                with open(f"{path}.idx", "wb") as file:
+                    file.write(data)
+                sheet1 = Sheet(Excel(filename=path, index_cache=True), "Name")
+                self.assertEqual(sheet1.row_idx["Brian"], 4)
+
+    def test_index_key_types(self):
+        keys = ["Brian", 1989, 2.5, True, datetime.datetime(2024, 1, 2, 3, 4)]
+        keys += [datetime.date(2024, 1, 2), datetime.time(3, 4)]
+        for key in keys:
+            decoded = decode_index_key(json.loads(json.dumps(encode_index_key(key))))
+            self.assertEqual(decoded, key)
+            self.assertIs(type(decoded), type(key))
+        with self.assertRaises(TypeError):
+            encode_index_key(("Brian", 1989))
+        with self.assertRaises(ValueError):
+            decode_index_key(["i", "1989"])
+
+    def test_unsaved_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\\excel_test.xlsx", path)
+            Sheet(Excel(filename=path, index_cache=True), "Name")
+            excel_obj = Excel(filename=path, index_cache=True)
+            sheet1 = Sheet(excel_obj, "Name")
+            sheet1.delete_row("Michael")
+            sheet1.add_new_line({"Name": "Tony"})
+            sheet2 = Sheet(excel_obj, "Name")
+            self.assertNotIn("Michael", sheet2.row_idx)
+            self.assertIn("Tony", sheet2.row_idx)
+            self.assertEqual(sheet2.get_cell("Brian", "Age"), 33)
+            sheets = excel_obj.sheets("Name", ["Sheet 1"], lazy=True)
+            self.assertEqual(sheets["Sheet 1"].get_cell("Brian", "Age"), 33)
+
+    def test_outside_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\\excel_test.xlsx", path)
+            Sheet(Excel(filename=path, index_cache=True), "Name")
+            wb = openpyxl.load_workbook(path)
+            wb["Sheet 1"].append(["Tony", None, None, 40])
+            wb.save(path)
+            sheet1 = Sheet(Excel(filename=path, index_cache=True), "Name")
+            self.assertEqual(sheet1.get_cell("Tony", "Age"), 40)
+
+
 # class TestAskToOpen(unittest.TestCase):
 #     # TODO Complete test
 #     def test_ask_to_open(self):
@@ -1,8 +1,10 @@
 import pandas as pd
-import unittest
+import unittest, random, tempfile, shutil, os
+from openpyxl.styles import Font
 
 # classes
-from easierexcel import Excel, Sheet
+from easierexcel import Excel, Sheet, ReadOnlyError, RowIndex, SecondaryIndex
+from easierexcel import parse_hyperlink
 
 
 class TestListInString(unittest.TestCase):
@@ -64,6 +66,12 @@ class TestGetIndex(unittest.TestCase):
         }
         self.assertEqual(row_index, row_index_ans)
 
+    def test_get_row_index_other_column(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        sheet1 = Sheet(excel_obj, "Birth Year")
+        row_index_ans = {1991: 2, 1990: 3, 1989: 4, 1988: 5, 1987: 6, 1986: 7}
+        self.assertEqual(sheet1.row_idx, row_index_ans)
+
 
 class TestIndirectCell(unittest.TestCase):
     def test_indirect_cell_pos(self):
@@ -146,6 +154,85 @@ class TestUpdateAndGet(unittest.TestCase):
         self.assertEqual(url, "https://www.Stark.com/")
 
 
+class TestHyperlinks(unittest.TestCase):
+    def test_parse_hyperlink(self):
+        formulas = {
+            '=HYPERLINK("https://www.Stark.com/","Website")': "https://www.Stark.com/",
+            "=hyperlink('Fantastic4.com', 'Website')": "Fantastic4.com",
+            '=HYPERLINK("say ""hi""")': 'say "hi"',
+            '=IFERROR(HYPERLINK("Avengers.com"),"")': "Avengers.com",
+            '=HYPERLINK(B2,"Website")': (None, "B2"),
+            "=HYPERLINK('Sheet 1'!$A$4)": ("Sheet 1", "A4"),
+            '"=HYPERLINK("https://www.Stark.com/","Website")"': None,
+            '=HYPERLINK(A2&".com")': None,
+            "Website": None,
+        }
+        for formula, answer in formulas.items():
+            self.assertEqual(parse_hyperlink(formula), answer)
+
+    def test_get_hyperlinks(self):
+        links = Sheet(Excel(filename="test\\excel_test.xlsx"), "Name", "Links")
+        answer = {"Tony Stark": "https://www.Stark.com/"}
+        self.assertEqual(links.get_hyperlinks("Website"), answer)
+        self.assertEqual(links.get_hyperlinks("Untouched Site Text"), {})
+        links = Sheet(Excel("test\\excel_test.xlsx", read_only=True), "Name", "Links")
+        self.assertEqual(links.get_hyperlinks("Website"), answer)
+
+    def test_cell_reference(self):
+        links = Sheet(Excel(filename="test\\excel_test.xlsx"), "Name", "Links")
+        links.update_cell("Tony Stark", "Untouched Site Text", "Stark.com")
+        links.update_cell("Tony Stark", "Website", '=HYPERLINK(C2,"Website")')
+        self.assertEqual(links.get_cell("Tony Stark", "Website"), "Stark.com")
+        links.update_cell("Tony Stark", "Website", "=HYPERLINK('Sheet 1'!A4)")
+        self.assertEqual(links.get_cell("Tony Stark", "Website"), "Brian")
+
+    def test_cache(self):
+        links = Sheet(Excel(filename="test\\excel_test.xlsx"), "Name", "Links")
+        links.get_hyperlinks("Website")
+        self.assertEqual(links.hyperlink_cache, {(2, 2): "https://www.Stark.com/"})
+        links.update_cell("Tony Stark", "Website", '=HYPERLINK("Stark.com")')
+        self.assertEqual(links.hyperlink_cache, {})
+        self.assertEqual(links.get_cell("Tony Stark", "Website"), "Stark.com")
+        links.update_cell("Tony Stark", "Website", "Stark Industries")
+        self.assertEqual(links.get_cell("Tony Stark", "Website"), "Stark Industries")
+
+
+class TestUpdateCells(unittest.TestCase):
+    def test_update_cells_dict(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        sheet1 = Sheet(excel_obj, "Name")
+        saves = []
+        excel_obj.save = lambda **kwargs: saves.append(kwargs)
+        updates = {
+            ("Brian", "Birth Month"): "May",
+            ("John", "Age"): 32,
+            ("Rob", "Age"): 50,
+            ("Bruce", "Age"): 40,
+        }
+        results = sheet1.update_cells(updates, save=True)
+        answer = {
+            ("Brian", "Birth Month"): True,
+            ("John", "Age"): False,
+            ("Rob", "Age"): True,
+            ("Bruce", "Age"): False,
+        }
+        self.assertEqual(results, answer)
+        self.assertEqual(len(saves), 1)
+        self.assertEqual(sheet1.get_cell("Brian", "Birth Month"), "May")
+        self.assertEqual(sheet1.get_cell("Rob", "Age"), 50)
+
+    def test_update_cells_dataframe(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        sheet1 = Sheet(excel_obj, "Name")
+        df = pd.DataFrame({"Age": [20, None]}, index=["Brian", "Rob"])
+        results = sheet1.update_cells(df, replace=False)
+        self.assertEqual(results, {("Brian", "Age"): False})
+        results = sheet1.update_cells(df)
+        self.assertEqual(results, {("Brian", "Age"): True})
+        self.assertEqual(sheet1.get_cell("Brian", "Age"), 20)
+        self.assertEqual(sheet1.get_cell("Rob", "Age"), 36)
+
+
 class TestAddNewLine(unittest.TestCase):
     def test_add_new_line(self):
         excel_obj = Excel(filename="test\excel_test.xlsx")
@@ -156,6 +243,49 @@ class TestAddNewLine(unittest.TestCase):
         self.assertEqual(sheet1.get_cell("Donna", "Age"), 12)
 
 
+class TestAddNewLines(unittest.TestCase):
+    def test_add_new_lines_dicts(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        sheet1 = Sheet(excel_obj, "Name")
+        lines = [
+            {"Name": "Donna", "Birth Month": "October", "Age": 12},
+            {"Age": 40, "Name": "Bruce", "Hobby": "Detective"},
+        ]
+        self.assertEqual(sheet1.add_new_lines(lines), 2)
+        self.assertEqual(sheet1.row_idx["Donna"], 8)
+        self.assertEqual(sheet1.row_idx["Bruce"], 9)
+        self.assertEqual(sheet1.get_cell("Donna", "Birth Month"), "October")
+        self.assertEqual(sheet1.get_cell("Bruce", "Age"), 40)
+        self.assertEqual(sheet1.missing_columns, ["Hobby"])
+
+    def test_add_new_lines_tuples(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        sheet1 = Sheet(excel_obj, "Name")
+        lines = [("Donna", "October", 2010, 12), ("Bruce", "May")]
+        self.assertEqual(sheet1.add_new_lines(lines), 2)
+        self.assertEqual(sheet1.get_cell("Donna", "Birth Year"), 2010)
+        self.assertEqual(sheet1.get_cell("Bruce", "Birth Month"), "May")
+
+    def test_add_new_lines_dataframe(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        sheet1 = Sheet(excel_obj, "Name")
+        df = pd.DataFrame({"Age": [12, None], "Name": ["Donna", "Bruce"]})
+        self.assertEqual(sheet1.add_new_lines(df), 2)
+        self.assertEqual(sheet1.get_cell("Donna", "Age"), 12)
+        self.assertEqual(sheet1.get_cell("Bruce", "Age"), "")
+
+    def test_add_new_lines_missing_key(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        sheet1 = Sheet(excel_obj, "Name")
+        lines = [{"Name": "Donna"}, {"Age": 12}]
+        with self.assertRaises(ValueError):
+            sheet1.add_new_lines(lines)
+        # nothing is added when any line is missing its key
+        self.assertNotIn("Donna", sheet1.row_idx)
+        self.assertEqual(sheet1.cur_sheet._current_row, 7)
+        self.assertFalse(excel_obj.changes_made)
+
+
 class TestDelete(unittest.TestCase):
     def test_delete_by_row(self):
         excel_obj = Excel(filename="test\excel_test.xlsx")
@@ -171,6 +301,123 @@ class TestDelete(unittest.TestCase):
         sheet1.delete_column("Age")
         self.assertFalse(sheet1.get_cell("Brian", "Age"))
 
+    def test_delete_row_shifts_index(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        sheet1 = Sheet(excel_obj, "Name")
+        sheet1.delete_row("John")
+        sheet1.delete_row("Allison")
+        self.assertEqual(sheet1.row_idx["Brian"], 3)
+        self.assertEqual(sheet1.row_idx["Rob"], 5)
+        self.assertEqual(sheet1.get_cell("Rob", "Birth Month"), "September")
+        self.assertTrue(sheet1.update_cell("Daniel", "Age", 40))
+        self.assertEqual(sheet1.cur_sheet.cell(row=4, column=4).value, 40)
+        # new lines are still indexed correctly after deletes
+        sheet1.add_new_line({"Name": "Donna", "Birth Month": "October"})
+        self.assertEqual(sheet1.get_cell("Donna", "Birth Month"), "October")
+        sheet1.delete_row("Michael")
+        self.assertEqual(sheet1.get_cell("Donna", "Birth Month"), "October")
+        self.assertEqual(sheet1.get_cell("Brian", "Age"), 33)
+
+    def test_delete_column_shifts_index(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        sheet1 = Sheet(excel_obj, "Name")
+        sheet1.delete_column("Birth Month")
+        self.assertEqual(sheet1.col_idx, {"Name": 1, "Birth Year": 2, "Age": 3})
+        self.assertEqual(sheet1.get_cell("Brian", "Age"), 33)
+        self.assertIsNone(sheet1.get_cell("Brian", "Birth Month"))
+
+    def test_delete_rows(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        sheet1 = Sheet(excel_obj, "Name")
+        ranges = []
+        delete_rows = sheet1.cur_sheet.delete_rows
+
+        def record_delete_rows(idx, amount=1):
+            ranges.append((idx, amount))
+            delete_rows(idx, amount)
+
+        sheet1.cur_sheet.delete_rows = record_delete_rows
+        deleted = sheet1.delete_rows(["Brian", "John", "Rob", "Bruce", "John"])
+        self.assertEqual(deleted, 3)
+        self.assertEqual(ranges, [(7, 1), (3, 2)])
+        self.assertEqual(
+            dict(sheet1.row_idx), {"Michael": 2, "Allison": 3, "Daniel": 4}
+        )
+        self.assertEqual(sheet1.get_cell("Daniel", "Birth Month"), "August")
+        self.assertEqual(sheet1.cur_sheet.max_row, 4)
+
+
+class TestRowIndex(unittest.TestCase):
+    def test_matches_list_deletes(self):
+        rows = [f"row {i}" for i in range(2, 500)]
+        row_idx = RowIndex({key: i for i, key in enumerate(rows, start=2)})
+        rng = random.Random(3)
+        for _ in range(300):
+            key = rng.choice(rows)
+            row = row_idx.pop(key)
+            self.assertEqual(row, rows.index(key) + 2)
+            rows.remove(key)
+            row_idx.remove_rows([row])
+        answer = {key: i for i, key in enumerate(rows, start=2)}
+        self.assertEqual(row_idx, answer)
+
+    def test_set_after_delete(self):
+        row_idx = RowIndex({"a": 2, "b": 3, "c": 4})
+        row_idx.remove_rows([row_idx.pop("b")])
+        row_idx["d"] = 4
+        self.assertEqual(dict(row_idx), {"a": 2, "c": 3, "d": 4})
+
+
+class TestSecondaryIndex(unittest.TestCase):
+    def setUp(self):
+        self.sheet = Sheet(Excel(filename="test\\excel_test.xlsx"), "Name")
+
+    def test_find(self):
+        self.assertEqual(self.sheet.find_rows("Birth Year", 1989), [4])
+        self.assertEqual(self.sheet.find("Age", 35), ["Daniel"])
+        self.assertEqual(
+            self.sheet.find(["Name", "Birth Year"], ("Brian", 1989)), ["Brian"]
+        )
+        self.assertEqual(self.sheet.find(["Name", "Birth Year"], ("Brian", 1990)), [])
+        with self.assertRaises(KeyError):
+            self.sheet.get_index("Missing Column")
+
+    def test_kept_up_to_date(self):
+        index = self.sheet.get_index("Age")
+        composite = self.sheet.get_index(["Birth Month", "Age"])
+        self.sheet.update_cell("Brian", "Age", 31)
+        self.assertEqual(self.sheet.find("Age", 31), ["Michael", "Brian"])
+        self.assertNotIn(33, index)
+        self.assertEqual(
+            self.sheet.find(["Birth Month", "Age"], ("June", 31)), ["Brian"]
+        )
+        self.sheet.add_new_line({"Name": "Tony", "Age": 31})
+        self.assertEqual(index[31], [2, 4, 8])
+        self.assertEqual(composite[(None, 31)], [8])
+        self.sheet.delete_row("Michael")
+        self.assertEqual(self.sheet.find("Age", 31), ["Brian", "Tony"])
+        self.sheet.delete_rows(["John", "Brian"])
+        self.assertEqual(index[31], [5])
+        self.assertEqual(index[36], [4])
+        self.sheet.delete_column("Birth Month")
+        self.assertIn(("Age",), self.sheet.indexes)
+        self.assertNotIn(("Birth Month", "Age"), self.sheet.indexes)
+
+    def test_matches_list_deletes(self):
+        values = [i % 7 for i in range(2, 500)]
+        index = SecondaryIndex(("Value",))
+        for row, value in enumerate(values, start=2):
+            index.add(value, row)
+        rng = random.Random(5)
+        for _ in range(300):
+            row = rng.randrange(2, len(values) + 2)
+            values.pop(row - 2)
+            index.remove_rows([row])
+        answer = {}
+        for row, value in enumerate(values, start=2):
+            answer.setdefault(value, []).append(row)
+        self.assertEqual(dict(index), answer)
+
 
 class TestFormatting(unittest.TestCase):
     def test_format_picker(self):
@@ -258,6 +505,29 @@ class TestFormatting(unittest.TestCase):
             answers = sorted(column_list[entry])
             self.assertEqual(actions, answers)
 
+    def test_format_rules(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        options = {
+            "light_grey_fill": ["Rating"],
+            "percent": ["%", "Discount"],
+            "integer": ["ID"],
+            "left_align": ["Name"],
+        }
+        sheet1 = Sheet(excel_obj, "Name", options=options)
+        sheet2 = Sheet(excel_obj, "Name", "Sheet 2", options=dict(options))
+        rules = sheet1.format_rules
+        self.assertIs(rules, sheet2.format_rules)
+        self.assertTrue(rules.rules["percent"].search("big discount"))
+        self.assertEqual(rules.rules["integer"], frozenset(["ID"]))
+        self.assertEqual(rules.fill[0], "light_grey_fill")
+        actions = ["default_border", "center_align", "light_grey_fill", "percent"]
+        self.assertEqual(sheet1.format_picker("Rating %"), actions)
+        self.assertIn("Rating %", rules.actions)
+        # changed options are compiled again
+        options["integer"].append("Age")
+        self.assertIsNot(sheet1.format_rules, rules)
+        self.assertIn("integer", sheet1.format_picker("Age"))
+
     def test_get_column_formats(self):
         excel_obj = Excel(filename="test\excel_test.xlsx")
         options = {
@@ -314,13 +584,395 @@ class TestFormatting(unittest.TestCase):
         self.assertEqual(formats, answer)
 
 
+class TestReadOnly(unittest.TestCase):
+    def test_read_only_get_cell(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx", read_only=True)
+        sheet1 = Sheet(excel_obj, "Name")
+        col_index_ans = {"Name": 1, "Birth Month": 2, "Birth Year": 3, "Age": 4}
+        self.assertEqual(sheet1.col_idx, col_index_ans)
+        self.assertEqual(sheet1.row_idx["Rob"], 7)
+        self.assertEqual(sheet1.get_cell("Brian", "Birth Month"), "June")
+        self.assertEqual(sheet1.get_cell("Brian", 4), 33)
+        self.assertIsNone(sheet1.get_cell("Bruce", "Age"))
+
+    def test_read_only_hyperlink(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx", read_only=True)
+        sheet3 = Sheet(excel_obj, "Name", "Links")
+        url = sheet3.get_cell("Tony Stark", "Website")
+        self.assertEqual(url, "https://www.Stark.com/")
+
+    def test_read_only_refuses_writes(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx", read_only=True)
+        sheet1 = Sheet(excel_obj, "Name")
+        with self.assertRaises(ReadOnlyError):
+            sheet1.update_cell("Brian", "Birth Month", "May")
+        with self.assertRaises(ReadOnlyError):
+            sheet1.add_new_line({"Name": "Donna"})
+        with self.assertRaises(ReadOnlyError):
+            sheet1.delete_row("Brian")
+        with self.assertRaises(ReadOnlyError):
+            excel_obj.save(force_save=True)
+
+
+class TestFormatCell(unittest.TestCase):
+    def test_format_cell(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        options = {
+            "left_align": ["Name"],
+            "light_grey_fill": ["Age"],
+            "percent": ["Age"],
+            "integer": ["Birth Year"],
+        }
+        sheet1 = Sheet(excel_obj, "Name", options=options)
+        for row_i in [2, 3]:
+            for column, col_i in sheet1.col_idx.items():
+                sheet1.format_cell(column, row_i, col_i)
+        for row_i in [2, 3]:
+            name = sheet1.cur_sheet.cell(row=row_i, column=1)
+            self.assertEqual(name.alignment.horizontal, "left")
+            self.assertEqual(name.border.left.style, "thin")
+            month = sheet1.cur_sheet.cell(row=row_i, column=2)
+            self.assertEqual(month.alignment.horizontal, "center")
+            year = sheet1.cur_sheet.cell(row=row_i, column=3)
+            self.assertEqual(year.number_format, "0")
+            age = sheet1.cur_sheet.cell(row=row_i, column=4)
+            self.assertEqual(age.style, "Percent")
+            self.assertEqual(age.fill.start_color.rgb, "00F2F2F2")
+            self.assertEqual(age.border.bottom.style, "thin")
+        self.assertTrue(excel_obj.changes_made)
+
+    def test_format_all_cells_skips_blank_rows(self):
+        excel_obj = Excel(filename="test\\excel_test.xlsx")
+        sheet1 = Sheet(excel_obj, "Name")
+        sheet1.cur_sheet.cell(row=20, column=4)
+        sheet1.format_all_cells()
+        self.assertEqual(
+            sheet1.cur_sheet.cell(row=7, column=4).border.left.style, "thin"
+        )
+        self.assertIsNone(sheet1.cur_sheet.cell(row=15, column=4).border.left.style)
+        self.assertIsNone(sheet1.cur_sheet.cell(row=20, column=4).border.left.style)
+
+    def test_format_all_cells(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        options = {
+            "header": {"bold": True, "font_size": 16},
+            "left_align": ["Name"],
+            "integer": ["Birth Year"],
+        }
+        sheet1 = Sheet(excel_obj, "Name", options=options)
+        sheet1.delete_column("Birth Month")
+        sheet1.format_all_cells()
+        for cell in sheet1.cur_sheet[1]:
+            self.assertTrue(cell.font.bold)
+            self.assertEqual(cell.font.size, 16)
+        for row_i in range(2, 8):
+            name = sheet1.cur_sheet.cell(row=row_i, column=1)
+            self.assertEqual(name.alignment.horizontal, "left")
+            year = sheet1.cur_sheet.cell(row=row_i, column=2)
+            self.assertEqual(year.number_format, "0")
+            self.assertEqual(year.alignment.horizontal, "center")
+            age = sheet1.cur_sheet.cell(row=row_i, column=3)
+            self.assertEqual(age.border.top.style, "thin")
+            self.assertFalse(age.font.bold)
+
+    def test_dirty_rows(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        sheet1 = Sheet(excel_obj, "Name")
+        sheet1.update_cell("John", "Age", 40)
+        sheet1.update_cell("Rob", "Age", 40)
+        sheet1.add_new_line({"Name": "Donna"})
+        self.assertEqual(sheet1.dirty_rows, {3, 7, 8})
+        sheet1.delete_rows(["John", "Allison"])
+        self.assertEqual(sheet1.dirty_rows, {5, 6})
+        sheet1.format_all_cells()
+        self.assertEqual(sheet1.dirty_rows, set())
+
+    def test_incremental_format(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        options = {"integer": ["Age"]}
+        sheet1 = Sheet(excel_obj, "Name", options=options)
+        sheet1.update_cell("John", "Age", 40)
+        sheet1.format_all_cells(incremental=True)
+        self.assertEqual(sheet1.get_cell("John", "Age"), 40)
+        self.assertEqual(sheet1.cur_sheet.cell(row=3, column=4).number_format, "0")
+        self.assertEqual(
+            sheet1.cur_sheet.cell(row=4, column=4).number_format, "General"
+        )
+        # changed options format everything
+        options["integer"].append("Birth Year")
+        sheet1.format_all_cells(incremental=True)
+        self.assertEqual(sheet1.cur_sheet.cell(row=4, column=4).number_format, "0")
+        self.assertEqual(sheet1.cur_sheet.cell(row=4, column=3).number_format, "0")
+
+    def test_format_named_styles(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        options = {"percent": ["Age"], "left_align": ["Name"]}
+        sheet1 = Sheet(excel_obj, "Name", options=options, named_styles=True)
+        sheet1.format_all_cells()
+        name = "easierexcel default_border left_align"
+        age = "easierexcel default_border center_align percent"
+        self.assertIn(name, excel_obj.wb.named_styles)
+        self.assertIn(age, excel_obj.wb.named_styles)
+        for row_i in range(2, 8):
+            # names keep the number format they already have
+            cell = sheet1.cur_sheet.cell(row=row_i, column=1)
+            self.assertEqual(cell.number_format, "0")
+            self.assertEqual(cell.alignment.horizontal, "left")
+            cell = sheet1.cur_sheet.cell(row=row_i, column=4)
+            self.assertEqual(cell.style, age)
+            self.assertEqual(cell.number_format, "0%")
+        self.assertEqual(sheet1.cur_sheet.column_dimensions["D"].number_format, "0%")
+
+    def test_format_named_styles_keeps_cell_styles(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        options = {"left_align": ["Name"]}
+        sheet1 = Sheet(excel_obj, "Name", options=options, named_styles=True)
+        cell = sheet1.cur_sheet.cell(row=4, column=3)
+        cell.number_format = "0.00"
+        cell.font = Font(bold=True, color="FFFF0000")
+        sheet1.format_all_cells()
+        sheet1.format_all_cells()
+        self.assertEqual(cell.number_format, "0.00")
+        self.assertTrue(cell.font.bold)
+        self.assertEqual(cell.font.color.rgb, "FFFF0000")
+        self.assertEqual(cell.border.left.style, "thin")
+        other = sheet1.cur_sheet.cell(row=5, column=3)
+        self.assertEqual(other.style, "easierexcel default_border center_align")
+
+    def test_column_styles_are_shared(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        sheet1 = Sheet(excel_obj, "Name")
+        sheet2 = Sheet(excel_obj, "Name", "Sheet 2")
+        styles = sheet1.get_column_styles()
+        self.assertIs(styles["Name"], styles["Age"])
+        self.assertIs(styles["Name"], sheet2.get_column_styles()["Name"])
+
+
 class TestDataFrame(unittest.TestCase):
     def test_create_dataframe(self):
         excel_obj = Excel(filename="test\excel_test.xlsx")
         sheet1 = Sheet(excel_obj, "Name")
         df = sheet1.create_dataframe()
-        self.assertIsInstance(df, dict)
-        self.assertIsInstance(df["Sheet 1"], pd.DataFrame)
+        self.assertIsInstance(df, pd.DataFrame)
+        self.assertEqual(list(df.columns), ["Name", "Birth Month", "Birth Year", "Age"])
+        self.assertEqual(len(df), 6)
+        self.assertEqual(df["Age"].sum(), 201)
+
+    def test_create_dataframe_unsaved_changes(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        sheet1 = Sheet(excel_obj, "Name")
+        sheet1.update_cell("Brian", "Birth Month", "May")
+        df = sheet1.create_dataframe(na_vals=["April"])
+        self.assertEqual(df.loc[2, "Birth Month"], "May")
+        self.assertTrue(pd.isna(df.loc[0, "Birth Month"]))
+
+    def test_create_dataframe_na_and_blank_rows(self):
+        excel_obj = Excel(filename="test\\excel_test.xlsx")
+        sheet1 = Sheet(excel_obj, "Name")
+        sheet1.update_cell("Brian", "Birth Month", "N/A")
+        sheet1.update_cell("John", "Birth Month", "null")
+        # cells touched below the data don't add blank rows
+        sheet1.cur_sheet.cell(row=20, column=4)
+        df = sheet1.create_dataframe()
+        self.assertEqual(len(df), 6)
+        self.assertTrue(pd.isna(df.loc[2, "Birth Month"]))
+        self.assertTrue(pd.isna(df.loc[1, "Birth Month"]))
+        df = sheet1.create_dataframe(keep_default_na=False)
+        self.assertEqual(df.loc[2, "Birth Month"], "N/A")
+
+    def test_dataframe_cache(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        sheet1 = Sheet(excel_obj, "Name")
+        df = sheet1.create_dataframe()
+        df.loc[0, "Age"] = 99
+        self.assertEqual(sheet1.create_dataframe().loc[0, "Age"], 31)
+        sheet1.create_dataframe(na_vals=["April"])
+        self.assertEqual((sheet1.df_cache_hits, sheet1.df_cache_misses), (1, 2))
+        # changes clear the cache
+        sheet1.update_cell("Michael", "Age", 40)
+        self.assertEqual(sheet1.create_dataframe().loc[0, "Age"], 40)
+        sheet1.delete_row("Michael")
+        self.assertEqual(sheet1.create_dataframe().loc[0, "Name"], "John")
+        self.assertEqual((sheet1.df_cache_hits, sheet1.df_cache_misses), (1, 4))
+
+    def test_dataframe_cache_save(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "excel_test.xlsx")
+            shutil.copy("test\excel_test.xlsx", path)
+            excel_obj = Excel(filename=path, use_logging=False)
+            sheet1 = Sheet(excel_obj, "Name")
+            sheet1.create_dataframe()
+            excel_obj.save(use_print=False, force_save=True)
+            self.assertEqual(sheet1.df_cache, {})
+
+    def test_write_dataframe(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        sheet1 = Sheet(excel_obj, "Name")
+        df = sheet1.create_dataframe()
+        df["Age"] = df["Age"] + 1
+        df.loc[len(df)] = ["Donna", "October", 2010, 12]
+        result = sheet1.write_dataframe(df)
+        self.assertEqual(result, {"updated": 6, "added": 1})
+        self.assertEqual(sheet1.get_cell("Brian", "Age"), 34)
+        self.assertEqual(sheet1.get_cell("Donna", "Birth Year"), 2010)
+        result = sheet1.write_dataframe(df.set_index("Name"))
+        self.assertEqual(result, {"updated": 0, "added": 0})
+
+    def test_write_dataframe_keeps_na_text(self):
+        excel_obj = Excel(filename="test\excel_test.xlsx")
+        sheet1 = Sheet(excel_obj, "Name")
+        sheet1.update_cell("Brian", "Birth Month", "N/A")
+        sheet1.update_cell("Rob", "Birth Month", "None")
+        df = sheet1.create_dataframe()
+        result = sheet1.write_dataframe(df)
+        self.assertEqual(result, {"updated": 0, "added": 0})
+        self.assertEqual(sheet1.get_cell("Brian", "Birth Month"), "N/A")
+        self.assertEqual(sheet1.get_cell("Rob", "Birth Month"), "None")
+        result = sheet1.write_dataframe(df, clear_empty=True)
+        self.assertEqual(result, {"updated": 2, "added": 0})
+        self.assertIsNone(sheet1.get_cell("Brian", "Birth Month"))
+
+
+class TestBulkRead(unittest.TestCase):
+    def setUp(self):
+        self.sheet = Sheet(Excel(filename="test\\excel_test.xlsx"), "Name")
+
+    def test_get_column(self):
+        column = self.sheet.get_column("Age")
+        self.assertEqual(column["Brian"], 33)
+        self.assertEqual(len(column), 6)
+        self.sheet.delete_row("Michael")
+        column = self.sheet.get_column("Birth Year")
+        self.assertEqual(column["Rob"], 1986)
+        with self.assertRaises(KeyError):
+            self.sheet.get_column("Missing Column")
+
+    def test_get_row(self):
+        row = self.sheet.get_row("Brian")
+        answer = {"Name": "Brian", "Birth Month": "June", "Birth Year": 1989, "Age": 33}
+        self.assertEqual(row, answer)
+        self.assertIsNone(self.sheet.get_row("Missing Row"))
+
+    def test_get_cells(self):
+        cells = self.sheet.get_cells(["John", "Allison", "Nobody"], ["Age", "Nope"])
+        self.assertEqual(cells["John"], {"Age": 32, "Nope": None})
+        self.assertEqual(cells["Allison"]["Age"], 34)
+        self.assertEqual(cells["Nobody"], {"Age": None, "Nope": None})
+
+    def test_hyperlinks(self):
+        links = Sheet(Excel(filename="test\\excel_test.xlsx"), "Name", "Links")
+        column = links.get_column("Website")
+        self.assertIn("=HYPERLINK", column["Tony Stark"])
+        column = links.get_column("Website", hyperlinks=True)
+        self.assertEqual(column["Tony Stark"], links.get_cell("Tony Stark", "Website"))
+        row = links.get_row("Tony Stark", hyperlinks=True)
+        self.assertEqual(row["Website"], "https://www.Stark.com/")
+
+
+class TestQuery(unittest.TestCase):
+    def setUp(self):
+        self.sheet = Sheet(Excel(filename="test\\excel_test.xlsx"), "Name")
+
+    def test_query(self):
+        self.assertEqual(self.sheet.query("Age > 34"), ["Daniel", "Rob"])
+        answer = ["Daniel", "Rob"]
+        self.assertEqual(self.sheet.query("`Birth Year` < 1988 and Age > 30"), answer)
+        answer = ["Brian", "Allison"]
+        self.assertEqual(
+            self.sheet.query(lambda df: df["Birth Month"].str.startswith("J")),
+            answer,
+        )
+
+    def test_select(self):
+        df = self.sheet.select(["Birth Year", "Age"], "Age <= 32")
+        self.assertEqual(df.index.tolist(), ["Michael", "John"])
+        self.assertEqual(df.loc["John", "Birth Year"], 1990)
+        self.assertEqual(len(self.sheet.select()), 6)
+
+    def test_cache(self):
+        self.sheet.query("Age > 34")
+        self.assertIn("Age", self.sheet.column_cache)
+        self.assertNotIn("Birth Month", self.sheet.column_cache)
+        self.sheet.update_cell("Michael", "Age", 40)
+        self.assertEqual(self.sheet.column_cache, {})
+        self.assertEqual(self.sheet.query("Age > 34"), ["Michael", "Daniel", "Rob"])
+        self.sheet.delete_row("Daniel")
+        self.assertEqual(self.sheet.query("Age > 34"), ["Michael", "Rob"])
+
+    def test_cache_shared_worksheet(self):
+        other = Sheet(self.sheet.excel, "Birth Year")
+        self.assertEqual(
+            other.create_dataframe().set_index("Name").loc["Brian", "Age"], 33
+        )
+        self.assertEqual(other.query("Age > 34"), [1987, 1986])
+        self.sheet.update_cell("Brian", "Age", 50)
+        self.assertEqual(
+            other.create_dataframe().set_index("Name").loc["Brian", "Age"], 50
+        )
+        self.assertEqual(other.query("Age > 34"), [1989, 1987, 1986])
+
+
+class TestUpsert(unittest.TestCase):
+    def test_upsert(self):
+        excel_obj = Excel(filename="test\\excel_test.xlsx")
+        sheet1 = Sheet(excel_obj, "Name")
+        records = [
+            {"Name": "Brian", "Age": 33, "Birth Month": "June"},
+            {"Name": "John", "Age": 40},
+            {"Name": "Tony", "Age": 45, "Missing Column": 1},
+            {"Name": "Tony", "Birth Year": 1970},
+            {"Name": "Rob", "Birth Year": 1986},
+        ]
+        summary = sheet1.upsert(records)
+        self.assertEqual(summary, {"inserted": 1, "updated": 1, "unchanged": 2})
+        self.assertEqual(sheet1.get_cell("John", "Age"), 40)
+        self.assertEqual(sheet1.get_cell("Tony", "Age"), 45)
+        self.assertEqual(sheet1.get_cell("Tony", "Birth Year"), 1970)
+        self.assertEqual(sheet1.row_idx["Tony"], 8)
+        self.assertTrue(excel_obj.changes_made)
+        self.assertEqual(sheet1.dirty_rows, {3, 8})
+
+    def test_upsert_replace(self):
+        sheet1 = Sheet(Excel(filename="test\\excel_test.xlsx"), "Name")
+        summary = sheet1.upsert([{"Name": "Brian", "Age": 50}], replace=False)
+        self.assertEqual(summary, {"inserted": 0, "updated": 0, "unchanged": 1})
+        self.assertEqual(sheet1.get_cell("Brian", "Age"), 33)
+        with self.assertRaises(ValueError):
+            sheet1.upsert([{"Name": "Brian", "Age": 50}, {"Age": 20}])
+        self.assertEqual(sheet1.get_cell("Brian", "Age"), 33)
+        # falsy values still fill empty cells
+        sheet1.update_cell("Brian", "Age", None)
+        summary = sheet1.upsert([{"Name": "Brian", "Age": 0}], replace=False)
+        self.assertEqual(summary, {"inserted": 0, "updated": 1, "unchanged": 0})
+        self.assertEqual(sheet1.get_cell("Brian", "Age"), 0)
+
+
+class TestSheets(unittest.TestCase):
+    def test_sheets(self):
+        excel_obj = Excel(filename="test\\excel_test.xlsx")
+        sheets = excel_obj.sheets("Name")
+        self.assertEqual(list(sheets), ["Sheet 1", "Sheet 2", "Links"])
+        self.assertTrue(all(sheets.is_built(name) for name in sheets))
+        self.assertEqual(sheets["Sheet 1"].get_cell("Brian", "Birth Year"), 1989)
+        self.assertEqual(sheets["Sheet 2"].col_idx["Age"], 3)
+        self.assertIn("Tony Stark", sheets["Links"].row_idx)
+
+    def test_lazy_sheets(self):
+        excel_obj = Excel(filename="test\\excel_test.xlsx")
+        sheets = excel_obj.sheets(
+            {"Sheet 1": "Name", "Sheet 2": "Age"},
+            lazy=True,
+        )
+        self.assertEqual(len(sheets), 2)
+        self.assertFalse(sheets.is_built("Sheet 1"))
+        sheet2 = sheets["Sheet 2"]
+        self.assertIs(sheets["Sheet 2"], sheet2)
+        self.assertEqual(sheet2.column_name, "Age")
+        self.assertFalse(sheets.is_built("Sheet 1"))
+        with self.assertRaises(KeyError):
+            sheets["Links"]
+        with self.assertRaises(KeyError):
+            excel_obj.sheets("Name", ["Missing Sheet"])
 
 
 if __name__ == "__main__":